@@ -1,5 +1,38 @@
-from .entities import Default
-from .main import Conjector, properties
+from typing import TYPE_CHECKING, Any
 
-__all__ = ("properties", "Conjector", "Default")
+import importlib
+
+if TYPE_CHECKING:
+    from .entities import Default
+    from .main import Conjector, properties, register_converter, warmup
+
+__all__ = (
+    "properties",
+    "Conjector",
+    "Default",
+    "register_converter",
+    "warmup",
+)
 __version__ = "1.8.0"
+
+# submodules are imported on first access to their attributes
+_LAZY_ATTRIBUTES = {
+    "Default": "entities",
+    "Conjector": "main",
+    "properties": "main",
+    "register_converter": "main",
+    "warmup": "main",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,281 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import itertools
+import os
+import pathlib
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+StatKey = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    stat_key: StatKey
+    digest: Optional[bytes] = None
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    fingerprint: Fingerprint
+    checked_at: float
+    # approximate size is measured only if it's used (see `_measure`)
+    size: Optional[int]
+    last_used: int
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    entries: int
+    size: int
+    max_entries: Optional[int]
+    max_size: Optional[int]
+
+
+class PendingLoad:
+    def __init__(self) -> None:
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+
+    def set_result(
+        self, value: Any, error: Optional[BaseException] = None
+    ) -> None:
+        self.value = value
+        self.error = error
+        self._done.set()
+
+    def wait(self) -> Any:
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class ConfigCache:
+    def __init__(
+        self,
+        check_interval: Optional[float] = 1.0,
+        use_hash: bool = False,
+        max_entries: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> None:
+        # `check_interval=None` disables validation of cached files at all
+        self.check_interval = check_interval
+        self.use_hash = use_hash
+        # `max_size` is an approximate limit of parsed configs size in bytes
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries: Dict[pathlib.Path, CacheEntry] = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._clock = itertools.count()
+        # cache could be filled by several threads at the same time
+        self._lock = threading.RLock()
+        self._pending: Dict[pathlib.Path, PendingLoad] = {}
+        # changed on every stored or removed entry, so values resolved from
+        # cached configs can check if they are outdated
+        self.generation = 0
+
+    def get(self, path: pathlib.Path) -> Any:
+        # lookup is lock-free, values of entries are never changed (only
+        # validation data), new values are stored in new entries
+        entry = self._entries.get(path)
+        if entry is not None and self._is_valid(path, entry):
+            entry.last_used = next(self._clock)
+            self._hits += 1
+            return entry.value
+        with self._lock:
+            if entry is not None and self._entries.get(path) is entry:
+                self._remove(path)
+            self._misses += 1
+        return None
+
+    def get_or_load(
+        self,
+        path: pathlib.Path,
+        load: Callable[[], Tuple[Any, Optional[Fingerprint]]],
+    ) -> Any:
+        if (value := self.get(path)) is not None:
+            return value
+        with self._lock:
+            # value could be loaded by another thread after the cache miss
+            if (entry := self._entries.get(path)) is not None:
+                return entry.value
+            pending = self._pending.get(path)
+            is_loading = pending is None
+            if is_loading:
+                # only one thread loads a value, others wait for it
+                pending = self._pending[path] = PendingLoad()
+        if not is_loading:
+            return pending.wait()  # type: ignore
+        try:
+            value, fingerprint = load()
+            self.set(path, value, fingerprint)
+        except BaseException as e:
+            pending.set_result(None, e)  # type: ignore
+            raise
+        finally:
+            with self._lock:
+                del self._pending[path]
+        pending.set_result(value)  # type: ignore
+        return value
+
+    def set(
+        self,
+        path: pathlib.Path,
+        value: Any,
+        fingerprint: Optional[Fingerprint] = None,
+    ) -> None:
+        if fingerprint is None:
+            fingerprint = self.get_fingerprint(path)
+        entry = CacheEntry(
+            value=value,
+            fingerprint=fingerprint,
+            checked_at=time.monotonic(),
+            size=None if self.max_size is None else _get_deep_size(value),
+            last_used=next(self._clock),
+        )
+        with self._lock:
+            self._remove(path)
+            self._entries[path] = entry
+            self._size += entry.size or 0
+            self.generation += 1
+            self._evict(keep=path)
+
+    def pop(self, path: pathlib.Path) -> Any:
+        with self._lock:
+            entry = self._remove(path)
+        return None if entry is None else entry.value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+
+    def items(self) -> List[Tuple[pathlib.Path, Any, Fingerprint]]:
+        with self._lock:
+            return [
+                (path, entry.value, entry.fingerprint)
+                for path, entry in self._entries.items()
+            ]
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            self._measure()
+        return CacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            entries=len(self._entries),
+            size=self._size,
+            max_entries=self.max_entries,
+            max_size=self.max_size,
+        )
+
+    def get_fingerprint(self, path: pathlib.Path) -> Fingerprint:
+        digest = self._get_digest(path) if self.use_hash else None
+        return Fingerprint(get_stat_key(path), digest)
+
+    def __contains__(self, path: pathlib.Path) -> bool:
+        return path in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, path: pathlib.Path) -> Optional[CacheEntry]:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._size -= entry.size or 0
+            self.generation += 1
+        return entry
+
+    def _measure(self) -> None:
+        # walking parsed configs is expensive, so it's done only if size
+        # is limited or requested
+        for entry in self._entries.values():
+            if entry.size is None:
+                entry.size = _get_deep_size(entry.value)
+                self._size += entry.size
+
+    def _evict(self, keep: pathlib.Path) -> None:
+        # the most recent entry is kept even if it's bigger than `max_size`
+        while len(self._entries) > 1 and self._is_overflowed():
+            path = min(
+                (k for k in self._entries if k != keep),
+                key=lambda k: self._entries[k].last_used,
+            )
+            self._remove(path)
+
+    def _is_overflowed(self) -> bool:
+        if (
+            self.max_entries is not None
+            and len(self._entries) > self.max_entries
+        ):
+            return True
+        if self.max_size is None:
+            return False
+        self._measure()
+        return self._size > self.max_size
+
+    def _is_valid(self, path: pathlib.Path, entry: CacheEntry) -> bool:
+        now = time.monotonic()
+        if (
+            self.check_interval is None
+            or now - entry.checked_at < self.check_interval
+        ):
+            return True
+        fingerprint = entry.fingerprint
+        try:
+            stat_key = get_stat_key(path)
+            # file was touched, but the content could be the same
+            if stat_key != fingerprint.stat_key and (
+                fingerprint.digest is None
+                or self._get_digest(path) != fingerprint.digest
+            ):
+                return False
+        except OSError:
+            return False
+        if stat_key != fingerprint.stat_key:
+            entry.fingerprint = Fingerprint(stat_key, fingerprint.digest)
+        entry.checked_at = now
+        return True
+
+    def _get_digest(self, path: pathlib.Path) -> bytes:
+        import hashlib
+
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+
+
+def get_stat_key(path: pathlib.Path) -> StatKey:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _get_deep_size(obj: Any) -> int:
+    size = 0
+    seen = set()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            # objects like yaml nodes of composed configs
+            stack.append(vars(item))
+    return size
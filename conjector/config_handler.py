@@ -1,57 +1,147 @@
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-import configparser
+import contextlib
 import functools
-import inspect
-import json
+import importlib
+import itertools
+import marshal
+import mmap
+import os
 import pathlib
 import sys
+import threading
 import warnings
 from os.path import dirname, join, normpath, sep
+from types import FrameType
 
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    tomllib = None  # type: ignore
+from conjector.config_cache import (
+    ConfigCache,
+    Fingerprint,
+    StatKey,
+    get_stat_key,
+)
+from conjector.entities import ComposedConfig
+from conjector.parsers import Content, ParserBackend, get_default_backends
+from conjector.shared_snapshot import SNAPSHOT_ENV_VAR, SharedSnapshot
 
-try:
-    import tomli
-except ImportError:
-    tomli = None
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
 
-try:
-    import ujson
-except ImportError:
-    ujson = None  # type: ignore
-
-try:
-    import yaml
-except ImportError:
-    yaml = None  # type: ignore
+    from conjector.config_snapshot import SnapshotStore
 
+# parser libraries are imported on first access, `None` if not installed
+_OPTIONAL_MODULES = ("tomllib", "tomli", "ujson", "orjson", "msgspec", "yaml")
+_INSTALL_HINTS = {
+    "yaml": '"PyYAML" is not installed, run `pip install conjector[yaml]`',
+    "toml": '"tomli" is not installed, run `pip install conjector[toml]`',
+}
+_MAIN_MODULE = join("conjector", "main.py")
+_YAML_STR_TAG = "tag:yaml.org,2002:str"
+_YAML_MERGE_TAG = "tag:yaml.org,2002:merge"
 _K = TypeVar("_K")
 _V = TypeVar("_V")
 _T = TypeVar("_T")
 
 
+def __getattr__(name: str) -> Any:
+    if name not in _OPTIONAL_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _get_module(name)
+
+
+def _get_module(name: str) -> Any:
+    # globals are checked first, so patched modules are respected
+    if name in globals():
+        return globals()[name]
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        module = None
+    globals()[name] = module
+    return module
+
+
 class ConfigHandler:
     supported_config_mapping = {
         "pyproject.toml": ("tool", "conjector"),
         "tox.ini": ("conjector",),
         "setup.cfg": ("tool:conjector",),
     }
-    parsed_configs_map: Dict[pathlib.Path, Dict[str, Any]] = {}
+    parsed_configs_map = ConfigCache()
+    # yaml node trees to construct only requested roots of the config
+    composed_configs_map = ConfigCache()
+    partial_yaml_parsing = False
+    # on-disk snapshots of parsed configs shared between processes
+    snapshot_store: Optional["SnapshotStore"] = None
+    config_formats = {
+        ".yml": "yaml",
+        ".yaml": "yaml",
+        ".json": "json",
+        ".toml": "toml",
+        ".ini": "ini",
+        ".cfg": "ini",
+    }
+    # parsers of each format in order of preference
+    parser_backends = get_default_backends()
+    # files of this size in bytes (or bigger) are memory-mapped for parsers
+    # which support it, `None` disables it
+    mmap_threshold: Optional[int] = 1024 * 1024
+    # yaml files of this size in bytes (or bigger) are parsed in separate
+    # processes, so several files are parsed on multiple cores
+    process_pool_threshold: Optional[int] = None
+    process_pool_workers: Optional[int] = None
+    _process_pool: Optional["ProcessPoolExecutor"] = None
+    _process_pool_lock = threading.Lock()
+    # snapshot of configs published by the parent process, see
+    # `conjector.shared_snapshot.publish_snapshot`
+    _shared_snapshot: Optional[SharedSnapshot] = None
+    _shared_snapshot_name: Optional[str] = None
+    _shared_snapshot_lock = threading.Lock()
+    _json_fallback_warned = False
 
-    def __init__(self) -> None:
-        self._caller_dir = self._get_caller_directory()
+    def __init__(self, caller_dir: Optional[str] = None) -> None:
+        self._caller_dir = caller_dir or self.get_caller_directory()
+        self._project_root: Optional[pathlib.Path] = None
 
     def get_config(self, filename: str, *, root: str) -> dict:
         path = self._get_config_path(filename)
+        if (
+            root
+            and self.partial_yaml_parsing
+            and path.suffix in (".yml", ".yaml")
+        ):
+            config = self.parse_yaml_root(path, root)
+            return {} if config is None else config
         raw_config = self.parse_config(path)
         return self._process_config(raw_config, root)
 
+    def get_cache_generation(self) -> Tuple[int, int]:
+        return (
+            self.parsed_configs_map.generation,
+            self.composed_configs_map.generation,
+        )
+
+    def validate_cached_config(self, filename: str) -> None:
+        # outdated (or deleted) entries are removed from the cache on lookup
+        path = pathlib.Path(normpath(join(self._caller_dir, filename)))
+        for cache in (self.parsed_configs_map, self.composed_configs_map):
+            if path in cache:
+                cache.get(path)
+
     def get_global_settings(self) -> dict:
-        project_root = self._get_project_root()
+        project_root = self.get_project_root()
         for config_type, sections in self.supported_config_mapping.items():
             file = project_root / config_type
             if not file.exists():
@@ -69,84 +159,333 @@ class ConfigHandler:
             return config
         return {}
 
+    def get_global_settings_fingerprint(self) -> Tuple[Optional[StatKey], ...]:
+        project_root = self.get_project_root()
+        fingerprint: List[Optional[StatKey]] = []
+        for config_type in self.supported_config_mapping:
+            try:
+                fingerprint.append(get_stat_key(project_root / config_type))
+            except OSError:
+                fingerprint.append(None)
+        return tuple(fingerprint)
+
     def parse_config(self, file_path: pathlib.Path) -> dict:
-        if conf := self.parsed_configs_map.get(file_path):
-            return conf
-        text_content = file_path.read_text()
-        if file_path.suffix in (".yml", ".yaml"):
-            conf = self._parse_yaml_config(text_content)
-        elif file_path.suffix == ".json":
-            conf = self._parse_json_config(text_content)
-        elif file_path.suffix == ".toml":
-            conf = self._parse_toml_config(text_content)
-        elif file_path.suffix in (".ini", ".cfg"):
-            conf = self._parse_ini_config(text_content)
+        return self.parsed_configs_map.get_or_load(
+            file_path, functools.partial(self._load_config, file_path)
+        )
+
+    def parse_yaml_root(self, file_path: pathlib.Path, root: str) -> Any:
+        composed = self.composed_configs_map.get_or_load(
+            file_path, functools.partial(self._compose_yaml_config, file_path)
+        )
+        if root not in composed.roots:
+            value = self._construct_yaml_root(composed.node, root)
+            # concurrently constructed roots are the same for all threads
+            composed.roots.setdefault(root, value)
+        return composed.roots[root]
+
+    @classmethod
+    def shutdown_process_pool(cls) -> None:
+        with cls._process_pool_lock:
+            if cls._process_pool is not None:
+                cls._process_pool.shutdown()
+                cls._process_pool = None
+
+    @classmethod
+    def preload(
+        cls,
+        paths: Iterable[Union[str, "os.PathLike[str]"]] = (),
+        *,
+        package: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[pathlib.Path]:
+        explicit_files = {
+            pathlib.Path(normpath(os.path.abspath(i))) for i in paths
+        }
+        files = set(explicit_files)
+        if package is not None:
+            files.update(cls._find_package_configs(package))
+        handler = cls(os.getcwd())
+
+        def preload_file(path: pathlib.Path) -> bool:
+            try:
+                handler.parse_config(path)
+            except Exception as e:
+                # found files could be not configs at all (like templates)
+                if path in explicit_files:
+                    raise
+                warnings.warn(
+                    f"Config file '{path}' is skipped: {e}", UserWarning
+                )
+                return False
+            return True
+
+        ordered_files = sorted(files)
+        # parsers hold GIL, so threads only overlap file reading and
+        # parsing of large files in the process pool
+        if max_workers is None and cls.process_pool_threshold is None:
+            is_loaded = list(map(preload_file, ordered_files))
         else:
-            raise NotImplementedError("Specified config type isn't supported!")
-        self.parsed_configs_map[file_path] = conf
-        return conf
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers) as executor:
+                is_loaded = list(executor.map(preload_file, ordered_files))
+        return list(itertools.compress(ordered_files, is_loaded))
 
     @classmethod
     def clear_cache(cls, path: Optional[pathlib.Path] = None) -> None:
         if path:
-            cls.parsed_configs_map.pop(path, None)
+            cls.parsed_configs_map.pop(path)
+            cls.composed_configs_map.pop(path)
         else:
             cls.parsed_configs_map.clear()
+            cls.composed_configs_map.clear()
+
+    @classmethod
+    def get_caller_directory(cls) -> str:
+        # walking frames is much cheaper than `inspect.stack()`, which reads
+        # source code of every frame in the stack
+        frame: Optional[FrameType] = sys._getframe()
+        caller_frame = frame
+        while frame is not None:
+            if cls._is_main_module(frame.f_code.co_filename):
+                caller_frame = frame.f_back
+            frame = frame.f_back
+        return dirname(caller_frame.f_code.co_filename)  # type: ignore
+
+    def get_project_root(self) -> pathlib.Path:
+        if self._project_root is None:
+            directory = pathlib.Path(self._caller_dir)
+            while (directory / "__init__.py").exists():
+                directory = directory.parent
+            self._project_root = directory
+        return self._project_root
 
-    def _get_project_root(self) -> pathlib.Path:
-        directory = pathlib.Path(self._caller_dir)
-        while (directory / "__init__.py").exists():
-            directory = directory.parent
-        return directory
+    @classmethod
+    def _get_shared_snapshot(cls) -> Optional[SharedSnapshot]:
+        name = os.environ.get(SNAPSHOT_ENV_VAR)
+        if name is None:
+            return None
+        if name != cls._shared_snapshot_name:
+            with cls._shared_snapshot_lock:
+                if name != cls._shared_snapshot_name:
+                    try:
+                        cls._shared_snapshot = SharedSnapshot(name)
+                    except (OSError, ValueError, EOFError, TypeError):
+                        # snapshot was released by the parent process
+                        cls._shared_snapshot = None
+                    cls._shared_snapshot_name = name
+        return cls._shared_snapshot
+
+    @classmethod
+    def _find_package_configs(cls, package: str) -> Iterator[pathlib.Path]:
+        import importlib.util
 
-    def _get_caller_directory(self) -> str:
-        stack = inspect.stack()
-        stack_depth = 0
-        for i, frame in enumerate(stack, 1):
-            if frame.filename.split(sep)[-2:] == ["conjector", "main.py"]:
-                stack_depth = i
-        return dirname(stack[stack_depth].filename)
+        spec = importlib.util.find_spec(package)
+        if spec is None or not spec.submodule_search_locations:
+            raise ModuleNotFoundError(f"Package '{package}' is not found!")
+        for location in spec.submodule_search_locations:
+            for path in pathlib.Path(location).rglob("*"):
+                if path.suffix in cls.config_formats and path.is_file():
+                    yield pathlib.Path(normpath(os.path.abspath(path)))
+
+    @staticmethod
+    def _is_main_module(filename: str) -> bool:
+        return filename == _MAIN_MODULE or filename.endswith(
+            sep + _MAIN_MODULE
+        )
 
     def _get_config_path(self, filename: str) -> pathlib.Path:
-        abs_config_path = join(self._caller_dir, normpath(filename))
+        # normalized path is the same for different relative paths of a file
+        abs_config_path = normpath(join(self._caller_dir, filename))
         file = pathlib.Path(abs_config_path)
         if not file.exists():
             raise FileNotFoundError(f"File '{file.name}' is not found!")
         return file
 
-    def _parse_yaml_config(self, text_content: str) -> dict:
+    def _get_yaml_loader(self) -> Any:
+        yaml = _get_module("yaml")
         if yaml is None:
-            raise ImportError(
-                '"PyYAML" is not installed, run `pip install conjector[yaml]`'
-            )
+            raise ImportError(_INSTALL_HINTS["yaml"])
         try:
-            SafeLoader = yaml.CSafeLoader
+            return yaml.CSafeLoader
         except AttributeError:
-            SafeLoader = yaml.SafeLoader  # type: ignore
-        # equivalent of yaml.safe_load() but could be faster with CSafeLoader
-        return yaml.load(text_content, SafeLoader)  # nosec
-
-    def _parse_json_config(self, text_content: str) -> dict:
-        if ujson is not None:
-            return ujson.loads(text_content)
-        warnings.warn(
-            "Using built-in library for JSON parsing. "
-            "It's recommended to use another library for this purpose. "
-            "To install run `pip install conjector[json]`",
-            UserWarning,
-        )
-        return json.loads(text_content)
+            return yaml.SafeLoader
+
+    def _parse_yaml_config(self, content: Content) -> dict:
+        backend, module = self._get_parser_backend("yaml")
+        return backend.loads(module, content)
+
+    def _construct_yaml_root(self, node: Any, root: str) -> Any:
+        yaml = _get_module("yaml")
+        keys = root.split(".")
+        for depth, key in enumerate(keys):
+            # merge keys change the mapping, so it's constructed as a whole
+            if not isinstance(node, yaml.MappingNode) or any(
+                k.tag == _YAML_MERGE_TAG for k, _ in node.value
+            ):
+                break
+            # the last one of duplicated keys is used, like in yaml.load()
+            matched_nodes = [
+                v
+                for k, v in node.value
+                if k.tag == _YAML_STR_TAG
+                and (k.value if depth else k.value.replace("-", "_")) == key
+            ]
+            if not matched_nodes:
+                raise KeyError(key)
+            node = matched_nodes[-1]
+        else:
+            return self._construct_yaml_node(node)
+        config = self._construct_yaml_node(node)
+        if depth == 0:
+            config = self._apply_to_key(
+                config, lambda x: str.replace(x, "-", "_")
+            )
+        return functools.reduce(lambda x, y: x[y], keys[depth:], config)
 
-    def _parse_toml_config(self, text_content: str) -> dict:
-        if tomllib is not None:
-            return tomllib.loads(text_content)
-        if tomli is not None:
-            return tomli.loads(text_content)
+    def _construct_yaml_node(self, node: Any) -> Any:
+        loader = self._get_yaml_loader()("")
+        try:
+            return loader.construct_document(node)
+        finally:
+            loader.dispose()
+
+    def _parse_json_config(self, content: Content) -> dict:
+        backend, module = self._get_parser_backend("json")
+        if backend.module == "json" and not self._json_fallback_warned:
+            ConfigHandler._json_fallback_warned = True
+            warnings.warn(
+                "Using built-in library for JSON parsing. "
+                "It's recommended to use another library for this purpose. "
+                "To install run `pip install conjector[json]`",
+                UserWarning,
+            )
+        return backend.loads(module, content)
+
+    def _parse_toml_config(self, content: Content) -> dict:
+        backend, module = self._get_parser_backend("toml")
+        return backend.loads(module, content)
+
+    def _get_parser_backend(
+        self, config_format: str
+    ) -> Tuple[ParserBackend, Any]:
+        for backend in self.parser_backends.get(config_format, ()):
+            if (module := _get_module(backend.module)) is not None:
+                return backend, module
         raise ImportError(
-            '"tomli" is not installed, run `pip install conjector[toml]`'
+            _INSTALL_HINTS.get(
+                config_format, f'No parser of "{config_format}" is installed'
+            )
         )
 
+    def _load_config(
+        self, file_path: pathlib.Path
+    ) -> Tuple[Any, Optional[Fingerprint]]:
+        fingerprint = self.parsed_configs_map.get_fingerprint(file_path)
+        shared_snapshot = self._get_shared_snapshot()
+        if shared_snapshot is not None:
+            item = shared_snapshot.get(file_path)
+            # file could be changed after the snapshot was published
+            if item is not None and item[1] == fingerprint.stat_key:
+                return item[0], fingerprint
+        snapshot_key = None
+        if self.snapshot_store is not None:
+            snapshot_key = self.snapshot_store.get_key(file_path)
+            conf = self.snapshot_store.load(file_path, snapshot_key)
+            if conf is not None:
+                return conf, fingerprint
+        config_format = self.config_formats.get(file_path.suffix)
+        if config_format is None:
+            raise NotImplementedError("Specified config type isn't supported!")
+        if (
+            self.process_pool_threshold is not None
+            and config_format == "yaml"
+            and fingerprint.stat_key[1] >= self.process_pool_threshold
+        ):
+            conf = self._parse_in_process_pool(file_path, config_format)
+        else:
+            conf = self._parse_file(file_path, config_format)
+        if self.snapshot_store is not None:
+            self.snapshot_store.dump(
+                file_path, snapshot_key, conf  # type: ignore
+            )
+        return conf, fingerprint
+
+    def _compose_yaml_config(
+        self, file_path: pathlib.Path
+    ) -> Tuple[ComposedConfig, Optional[Fingerprint]]:
+        fingerprint = self.composed_configs_map.get_fingerprint(file_path)
+        loader = self._get_yaml_loader()
+        with self._read_config(file_path, "yaml") as content:
+            node = _get_module("yaml").compose(content, loader)  # nosec
+        return ComposedConfig(node), fingerprint
+
+    def _parse_file(self, file_path: pathlib.Path, config_format: str) -> Any:
+        if config_format == "ini":
+            # `configparser` is the only parser of ini and reads text
+            return self._parse_ini_config(file_path.read_text())
+        parse: Callable[[Content], Any] = {
+            "yaml": self._parse_yaml_config,
+            "json": self._parse_json_config,
+            "toml": self._parse_toml_config,
+        }[config_format]
+        with self._read_config(file_path, config_format) as content:
+            return parse(content)
+
+    def _parse_in_process_pool(
+        self, file_path: pathlib.Path, config_format: str
+    ) -> Any:
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # the pool is created from threads of `preload`, and forking
+                # a multithreaded process could deadlock on held locks
+                ConfigHandler._process_pool = ProcessPoolExecutor(
+                    self.process_pool_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            future = self._process_pool.submit(  # type: ignore
+                _parse_config_file, str(file_path), config_format
+            )
+        # data is produced by `_parse_config_file` in the own pool
+        is_marshal, data = future.result()
+        if is_marshal:
+            return marshal.loads(data)  # nosec
+        import pickle  # nosec
+
+        return pickle.loads(data)  # nosec
+
+    @contextlib.contextmanager
+    def _read_config(
+        self, file_path: pathlib.Path, config_format: str
+    ) -> Iterator[Content]:
+        backend = None
+        if config_format in self.parser_backends:
+            backend, _ = self._get_parser_backend(config_format)
+        if backend is None or not backend.accepts_bytes:
+            yield file_path.read_text()
+            return
+        with open(file_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if (
+                not backend.accepts_mmap
+                or self.mmap_threshold is None
+                or size < max(self.mmap_threshold, 1)
+            ):
+                yield file.read()
+                return
+            # content of large files isn't copied into memory at all
+            with mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as content:
+                yield content
+
     def _parse_ini_config(self, text_content: str) -> dict:
+        import configparser
+
         parser = configparser.ConfigParser(strict=False)
         parser.read_string(text_content)
         parsed_result: Dict[str, Any] = {}
@@ -186,3 +525,19 @@ class ConfigHandler:
                 lambda x, y: x[y], root.split("."), config
             )
         return {} if config is None else config
+
+
+def _parse_config_file(
+    file_path: str, config_format: str
+) -> Tuple[bool, bytes]:
+    # runs in a child process, result is serialized by marshal which is
+    # faster than pickle used by the process pool by default
+    conf = ConfigHandler(dirname(file_path))._parse_file(
+        pathlib.Path(file_path), config_format
+    )
+    try:
+        return True, marshal.dumps(conf)
+    except ValueError:
+        import pickle  # nosec
+
+        return False, pickle.dumps(conf)
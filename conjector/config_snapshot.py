@@ -0,0 +1,76 @@
+from typing import Any, Optional, Union
+
+import contextlib
+import marshal
+import os
+import pathlib
+import sys
+
+# snapshots are incompatible between marshal and Python versions
+_SNAPSHOT_VERSION = (1, marshal.version, *sys.version_info[:2])
+
+
+class SnapshotStore:
+    def __init__(self, directory: Union[str, os.PathLike]) -> None:
+        self.directory = pathlib.Path(directory).expanduser()
+
+    def load(self, path: pathlib.Path, key: tuple) -> Optional[Any]:
+        # snapshots are written only by `dump` to the directory configured
+        # by the application, like other cache files of it
+        try:
+            with open(self.get_snapshot_path(path), "rb") as file:
+                if marshal.load(file) != key:  # nosec
+                    return None
+                return marshal.load(file)  # nosec
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def dump(self, path: pathlib.Path, key: tuple, value: Any) -> bool:
+        try:
+            header = marshal.dumps(key)
+            # values which aren't supported by marshal (e.g. datetime objects
+            # of toml configs) aren't stored at all
+            payload = marshal.dumps(value)
+        except ValueError:
+            return False
+        import tempfile
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        except OSError:
+            return False
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(header)
+                file.write(payload)
+            # concurrent processes never read partially written snapshots
+            os.replace(tmp_path, self.get_snapshot_path(path))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            return False
+        return True
+
+    def get_snapshot_path(self, path: pathlib.Path) -> pathlib.Path:
+        import hashlib
+
+        key = hashlib.blake2b(
+            os.fsencode(os.path.abspath(path)), digest_size=16
+        ).hexdigest()
+        return self.directory / f"{key}.snapshot"
+
+    def get_key(self, path: pathlib.Path) -> tuple:
+        import hashlib
+
+        # file is checked before reading, so if it's changed after that,
+        # the snapshot is outdated by modification time
+        stat = os.stat(path)
+        content = path.read_bytes()
+        return (
+            _SNAPSHOT_VERSION,
+            os.path.abspath(path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            hashlib.blake2b(content, digest_size=16).digest(),
+        )
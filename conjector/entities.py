@@ -1,6 +1,7 @@
-from typing import Any
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from dataclasses import dataclass, fields
+import inspect
+from dataclasses import dataclass, field, fields
 
 _DefaultType: Any = object
 MISSING: Any = object()
@@ -18,13 +19,59 @@ class Settings:
     root: str = ""
     type_cast: bool = True
     lazy_init: bool = False
+    bake_defaults: bool = False
+    lazy_collections: bool = False
+    lazy_attributes: bool = False
+
+    def is_resolved(self) -> bool:
+        return not any(
+            isinstance(getattr(self, settings_field.name), Default)
+            for settings_field in fields(Settings)
+        )
 
     def __or__(self, other: "Settings") -> "Settings":
         merged_kwargs = {}
-        for field in fields(Settings):
-            other_val = getattr(other, field.name)
-            self_val = getattr(self, field.name)
-            merged_kwargs[field.name] = (
+        for settings_field in fields(Settings):
+            other_val = getattr(other, settings_field.name)
+            self_val = getattr(self, settings_field.name)
+            merged_kwargs[settings_field.name] = (
                 other_val if not isinstance(other_val, Default) else self_val
             )
         return Settings(**merged_kwargs)
+
+
+# plans are compared by identity to be stored in weak mappings
+@dataclass(eq=False)
+class CallPlan:
+    signature: inspect.Signature
+    type_hints: Dict[str, Any]
+    default_values: Dict[str, Any]
+    resolved_signature: Optional[inspect.Signature] = None
+    # config file and cache state which the signature is resolved from
+    filename: str = ""
+    generation: Optional[Tuple[int, int]] = None
+    checked_at: float = 0.0
+    # resolved defaults which are copied on each call (like lists or dicts),
+    # so changes of them don't leak between calls
+    mutable_defaults: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SettingsEntry:
+    settings: Settings
+    fingerprint: tuple
+    checked_at: float
+
+
+@dataclass(frozen=True)
+class TypeMetadata:
+    type_hints: Dict[str, Any]
+    # name, type and default getter of dataclass fields passed to `__init__`
+    init_fields: Tuple[Tuple[str, Any, Callable[[], Any]], ...] = ()
+
+
+@dataclass
+class ComposedConfig:
+    node: Any
+    # constructed values of requested roots
+    roots: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,111 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Union,
+    overload,
+)
+
+from collections.abc import Mapping, Sequence
+
+_NOT_CAST: Any = object()
+
+
+class LazySequence(Sequence):
+    """
+    Read-only list view which casts config values on first access.
+    """
+
+    __slots__ = ("_values", "_cast_item", "_cast_values")
+
+    def __init__(self, values: list, cast_item: Callable[[Any], Any]) -> None:
+        self._values = values
+        self._cast_item = cast_item
+        self._cast_values: List[Any] = [_NOT_CAST] * len(values)
+
+    @overload
+    def __getitem__(self, index: int) -> Any:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        value = self._cast_values[index]
+        if value is _NOT_CAST:
+            value = self._cast_item(self._values[index])
+            self._cast_values[index] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (LazySequence, list, tuple)):
+            return len(self) == len(other) and all(
+                i == j for i, j in zip(self, other)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+class LazyMapping(Mapping):
+    """
+    Read-only dict view which casts config values on first access. Keys are
+    cast immediately.
+    """
+
+    __slots__ = ("_values", "_cast_value", "_cast_values")
+
+    def __init__(self, values: dict, cast_value: Callable[[Any], Any]) -> None:
+        self._values = values
+        self._cast_value = cast_value
+        self._cast_values: Dict[Any, Any] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._cast_values[key]
+        except KeyError:
+            value = self._cast_value(self._values[key])
+            self._cast_values[key] = value
+            return value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class LazyAttribute:
+    """
+    Class attribute which is resolved on first access and then replaced with
+    the resolved value.
+    """
+
+    __slots__ = ("_owner", "_name", "_resolve", "__weakref__")
+
+    def __init__(
+        self, owner: type, name: str, resolve: Callable[[], Any]
+    ) -> None:
+        self._owner = owner
+        self._name = name
+        self._resolve = resolve
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        value = self._resolve()
+        # the attribute could be replaced while the value was resolved
+        if vars(self._owner).get(self._name) is self:
+            setattr(self._owner, self._name, value)
+        return value
@@ -2,84 +2,292 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Optional,
     Set,
     Type,
     TypeVar,
     Union,
-    get_type_hints,
     overload,
 )
 
+import copy
+import datetime
+import enum
 import functools
+import gc
 import inspect
+import os
+import pathlib
+import time
+import types
+import warnings
+import weakref
 
 from conjector.config_handler import ConfigHandler
-from conjector.entities import MISSING, Default, Settings
+from conjector.entities import (
+    MISSING,
+    CallPlan,
+    Default,
+    Settings,
+    SettingsEntry,
+)
+from conjector.lazy import LazyAttribute, LazyMapping, LazySequence
 from conjector.type_converter import TypeConverter
 
 _T = TypeVar("_T")
+_IMMUTABLE_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    enum.Enum,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    # read-only views of lazy collections aren't copied (that would cast all
+    # elements), so their cast elements are shared between calls
+    LazySequence,
+    LazyMapping,
+)
 
 
 class Conjector:
     _allowed_dunder = ("__init__",)
-
-    def __init__(self) -> None:
-        self._type_converter = TypeConverter()
-        self._config_handler = ConfigHandler()
+    _type_converter = TypeConverter()
+    _shared_instances: Dict[str, "Conjector"] = {}
+    _global_settings_map: Dict[pathlib.Path, SettingsEntry] = {}
+    # plans of wrapped functions which are resolved on first call
+    # (with settings to resolve them), only plans of alive functions are kept
+    _pending_plans: "weakref.WeakKeyDictionary[CallPlan, tuple]" = (
+        weakref.WeakKeyDictionary()
+    )
+    # lazy class attributes which aren't accessed yet
+    _pending_attributes: "weakref.WeakSet[LazyAttribute]" = weakref.WeakSet()
+
+    def __init__(self, caller_dir: Optional[str] = None) -> None:
+        self._config_handler = ConfigHandler(caller_dir)
+
+    @classmethod
+    def shared(cls) -> "Conjector":
+        caller_dir = ConfigHandler.get_caller_directory()
+        if (conjector := cls._shared_instances.get(caller_dir)) is None:
+            conjector = cls._shared_instances[caller_dir] = cls(caller_dir)
+        return conjector
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._global_settings_map.clear()
+
+    @classmethod
+    def resolve_pending_plans(cls) -> None:
+        failed_plans = {}
+        while cls._pending_plans:
+            plan, (conjector, settings) = cls._pending_plans.popitem()
+            if plan.resolved_signature is not None:
+                continue
+            try:
+                conjector._resolve_call_plan(plan, settings)
+            except Exception as e:
+                # such errors are raised on call of the function as usual
+                warnings.warn(f"Defaults aren't resolved: {e}", UserWarning)
+                failed_plans[plan] = (conjector, settings)
+        cls._pending_plans.update(failed_plans)
+
+    @classmethod
+    def resolve_pending_attributes(cls) -> None:
+        for attribute in list(cls._pending_attributes):
+            try:
+                attribute.__get__(None)
+            except Exception as e:
+                # such errors are raised on access to the attribute as usual
+                warnings.warn(
+                    f"Lazy attribute isn't resolved: {e}", UserWarning
+                )
 
     def inject_config(
         self, cls: Type[_T], settings: Optional[Settings] = None
     ) -> Type[_T]:
         settings = self._get_merged_settings(settings)
+        type_hints = self._type_converter.get_type_metadata(cls).type_hints
+        if settings.lazy_attributes and not settings.lazy_init:
+            # methods are wrapped first, because it gets all class attributes
+            self._wrap_class_methods(cls, settings.bake_defaults)
+            self._inject_lazy_attributes(cls, type_hints, settings)
+            return cls
         config = self._config_handler.get_config(
             settings.filename, root=settings.root
         )
         cast_values = self._get_cast_config_values(
-            config, get_type_hints(cls), settings.type_cast
+            config, type_hints, settings.type_cast, settings.lazy_collections
         )
         self._inject_values_in_class(
             cls, cast_values, settings.lazy_init, settings.override_default
         )
-        self._wrap_class_methods(cls)
+        self._wrap_class_methods(cls, settings.bake_defaults)
         return cls
 
+    def wrap_function(
+        self, func: Callable[..., _T], settings: Optional[Settings] = None
+    ) -> Callable[..., _T]:
+        settings = self._get_merged_settings(settings)
+        if settings.bake_defaults:
+            baked_func = self._bake_function(func, settings)
+            if baked_func is not None:
+                return baked_func
+        return self._wrap_function(func, settings)
+
     def replace_defaults(
         self,
         func: Callable[..., _T],
         args: tuple,
         kwargs: dict,
         settings: Optional[Settings] = None,
+        plan: Optional[CallPlan] = None,
     ) -> _T:
+        if plan is None:
+            plan = self.make_call_plan(func)
+        if self._is_outdated_plan(plan):
+            self._resolve_call_plan(plan, settings)
+        if not plan.type_hints:
+            return func(*args, **kwargs)
+        params = plan.resolved_signature.bind(*args, **kwargs)  # type: ignore
+        for name, value in plan.mutable_defaults.items():
+            if name not in params.arguments:
+                params.arguments[name] = copy.deepcopy(value)
+        params.apply_defaults()
+        return func(*params.args, **params.kwargs)
+
+    def make_call_plan(self, func: Callable) -> CallPlan:
+        try:
+            signature = inspect.signature(func)
+        except (ValueError, TypeError):
+            # callables without introspectable signature (like builtins)
+            # can't have `Default` params, so they are called as is
+            return CallPlan(inspect.Signature(), {}, {})
+        return CallPlan(
+            signature=signature,
+            type_hints=self._get_func_type_hints(signature),
+            default_values=self._get_func_default_values(signature),
+        )
+
+    def _is_outdated_plan(self, plan: CallPlan) -> bool:
+        if plan.resolved_signature is None:
+            return True
+        config_handler = self._config_handler
+        check_interval = config_handler.parsed_configs_map.check_interval
+        now = time.monotonic()
+        if check_interval is not None and (
+            now - plan.checked_at >= check_interval
+        ):
+            plan.checked_at = now
+            config_handler.validate_cached_config(plan.filename)
+        return plan.generation != config_handler.get_cache_generation()
+
+    def _resolve_call_plan(
+        self, plan: CallPlan, settings: Optional[Settings]
+    ) -> None:
         settings = self._get_merged_settings(settings)
         config = self._config_handler.get_config(
             settings.filename, root=settings.root
         )
         cast_values = self._get_cast_config_values(
-            config, self._get_func_type_hints(func), settings.type_cast
+            config,
+            plan.type_hints,
+            settings.type_cast,
+            settings.lazy_collections,
         )
-        default_values = self._get_func_default_values(func)
         combined_values = self._combine_cast_and_default_values(
-            cast_values, default_values, set(config.keys())
+            cast_values, plan.default_values, set(config.keys())
         )
-        param = self._inject_values_in_func(
-            func, combined_values, args, kwargs
+        plan.mutable_defaults = {
+            name: value
+            for name, value in combined_values.items()
+            if not _is_immutable(value)
+        }
+        plan.resolved_signature = self._replace_signature_defaults(
+            plan.signature, combined_values
         )
-        return func(*param.args, **param.kwargs)
-
-    def _wrap_class_methods(self, cls: type) -> None:
-        def replace_default(func: Callable) -> Callable:
-            @functools.wraps(func)
-            def wrapper(*args: Any, **kwargs: Any) -> Callable:
-                return self.replace_defaults(func, args, kwargs)
-
-            return wrapper
+        plan.filename = settings.filename
+        plan.checked_at = time.monotonic()
+        # configs loaded while resolving are already used by the plan
+        plan.generation = self._config_handler.get_cache_generation()
 
+    def _wrap_class_methods(self, cls: type, bake_defaults: bool) -> None:
         methods = self._get_class_methods(cls)
         for method in methods:
+            if bake_defaults:
+                baked_method = self._bake_method(
+                    inspect.getattr_static(cls, method)
+                )
+                if baked_method is not None:
+                    setattr(cls, method, baked_method)
+                    continue
             original_method = getattr(cls, method)
-            setattr(cls, method, replace_default(original_method))
+            setattr(cls, method, self._wrap_function(original_method))
+
+    def _wrap_function(
+        self, func: Callable[..., _T], settings: Optional[Settings] = None
+    ) -> Callable[..., _T]:
+        plan = self.make_call_plan(func)
+        self._pending_plans[plan] = (self, settings)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> _T:
+            return self.replace_defaults(func, args, kwargs, settings, plan)
+
+        return wrapper
+
+    def _bake_method(self, method: Any) -> Any:
+        if isinstance(method, (classmethod, staticmethod)):
+            baked_func = self._bake_function(method.__func__)
+            return None if baked_func is None else type(method)(baked_func)
+        return self._bake_function(method)
+
+    def _bake_function(
+        self, func: Callable[..., _T], settings: Optional[Settings] = None
+    ) -> Optional[Callable[..., _T]]:
+        # only plain functions keep their defaults in `__defaults__` and
+        # `__kwdefaults__`, other callables are wrapped as usual
+        if not inspect.isfunction(func) or hasattr(func, "__wrapped__"):
+            return None
+        plan = self.make_call_plan(func)
+        if not plan.type_hints:
+            return func
+        self._resolve_call_plan(plan, settings)
+        return self._copy_func_with_defaults(
+            func, plan.resolved_signature  # type: ignore
+        )
+
+    def _copy_func_with_defaults(
+        self, func: Callable[..., _T], signature: inspect.Signature
+    ) -> Callable[..., _T]:
+        defaults = []
+        kwdefaults = {}
+        for name, param in signature.parameters.items():
+            if param.default is param.empty:
+                continue
+            if param.kind == param.KEYWORD_ONLY:
+                kwdefaults[name] = param.default
+            elif param.kind != param.VAR_POSITIONAL:
+                defaults.append(param.default)
+        new_func = types.FunctionType(
+            func.__code__,  # type: ignore
+            func.__globals__,  # type: ignore
+            func.__name__,
+            tuple(defaults) or None,
+            func.__closure__,  # type: ignore
+        )
+        if kwdefaults:
+            new_func.__kwdefaults__ = kwdefaults
+        functools.update_wrapper(new_func, func)
+        # baked function has its own signature, so it isn't a wrapper
+        delattr(new_func, "__wrapped__")
+        return new_func
 
     def _get_class_methods(self, obj: type) -> List[str]:
         def is_dunder_name(name: str) -> bool:
@@ -110,22 +318,56 @@ class Conjector:
         if not lazy_init:
             self._init_props(cast_values, cls, override_init=override_default)
 
-    def _inject_values_in_func(
-        self, func: Callable, values: Dict[str, Any], args: tuple, kwargs: dict
-    ) -> inspect.BoundArguments:
+    def _inject_lazy_attributes(
+        self, cls: type, type_hints: Dict[str, Any], settings: Settings
+    ) -> None:
+        @functools.lru_cache(maxsize=None)
+        def get_config() -> Dict[str, Any]:
+            return self._config_handler.get_config(
+                settings.filename, root=settings.root
+            )
+
+        def cast_value(name: str) -> Any:
+            return self._get_cast_config_values(
+                get_config(),
+                {name: type_hints[name]},
+                settings.type_cast,
+                settings.lazy_collections,
+            )[name]
+
+        def resolve(name: str, default: Any) -> Any:
+            # the same rules as `_init_props` uses for class attributes
+            value = cast_value(name)
+            if (settings.override_default and value) or default is None:
+                return value
+            return default
+
+        setattr(
+            cls,
+            "init_props",
+            lambda obj=cls, override_init=True: self._init_props(
+                {name: cast_value(name) for name in type_hints},
+                obj,
+                override_init=override_init,
+            ),
+        )
+        for name in type_hints:
+            default = getattr(cls, name, None)
+            if settings.override_default or default is None:
+                resolve_attribute = functools.partial(resolve, name, default)
+                attribute = LazyAttribute(cls, name, resolve_attribute)
+                setattr(cls, name, attribute)
+                self._pending_attributes.add(attribute)
+
+    def _replace_signature_defaults(
+        self, signature: inspect.Signature, values: Dict[str, Any]
+    ) -> inspect.Signature:
         new_params = []
-        func_params = inspect.signature(func).parameters
-        for name, param in func_params.items():
+        for name, param in signature.parameters.items():
             if self._is_override_default(param):
                 param = param.replace(default=values.get(name))
             new_params.append(param)
-        params = (
-            inspect.signature(func)
-            .replace(parameters=new_params)
-            .bind(*args, **kwargs)
-        )
-        params.apply_defaults()
-        return params
+        return signature.replace(parameters=new_params)
 
     def _combine_cast_and_default_values(
         self,
@@ -145,19 +387,23 @@ class Conjector:
             values[name] = value
         return values
 
-    def _get_func_default_values(self, func: Callable) -> Dict[str, Any]:
+    def _get_func_default_values(
+        self, signature: inspect.Signature
+    ) -> Dict[str, Any]:
         return {
             k: v.default.value
-            for k, v in inspect.signature(func).parameters.items()
+            for k, v in signature.parameters.items()
             if self._is_override_default(v)
         }
 
-    def _get_func_type_hints(self, func: Callable) -> Dict[str, Any]:
+    def _get_func_type_hints(
+        self, signature: inspect.Signature
+    ) -> Dict[str, Any]:
         # method is required because `typing.get_type_hints` doesn't work on
         # function parameters without type annotation.
         return {
             k: Any if v.annotation is v.empty else v.annotation
-            for k, v in inspect.signature(func).parameters.items()
+            for k, v in signature.parameters.items()
             if self._is_override_default(v)
         }
 
@@ -171,11 +417,14 @@ class Conjector:
         config: Dict[str, Any],
         type_hints: Dict[str, Any],
         type_cast: bool,
+        lazy_collections: bool = False,
     ) -> Dict[str, Any]:
         cast_values = {}
         for class_var, type_ in type_hints.items():
             value = config.get(class_var)
-            if type_cast:
+            if type_cast and lazy_collections:
+                value = self._type_converter.compile_lazy(type_)(value)
+            elif type_cast:
                 value = self._type_converter.cast_types(type_, value)
             cast_values[class_var] = value
         return cast_values
@@ -195,9 +444,29 @@ class Conjector:
                     setattr(obj, field, value)
 
     def _get_global_settings(self) -> Settings:
+        project_root = self._config_handler.get_project_root()
+        entry = self._global_settings_map.get(project_root)
+        now = time.monotonic()
+        check_interval = self._config_handler.parsed_configs_map.check_interval
+        if entry is not None and (
+            check_interval is None or now - entry.checked_at < check_interval
+        ):
+            return entry.settings
+        fingerprint = self._config_handler.get_global_settings_fingerprint()
+        if entry is None or entry.fingerprint != fingerprint:
+            entry = SettingsEntry(
+                self._read_global_settings(), fingerprint, now
+            )
+            self._global_settings_map[project_root] = entry
+        entry.checked_at = now
+        return entry.settings
+
+    def _read_global_settings(self) -> Settings:
         cast_settings = {}
         raw_settings = self._config_handler.get_global_settings()
-        for name, type_ in get_type_hints(Settings).items():
+        metadata = self._type_converter.get_type_metadata(Settings)
+        type_hints = metadata.type_hints
+        for name, type_ in type_hints.items():
             if name in raw_settings:
                 cast_settings[name] = self._type_converter.cast_types(
                     type_, raw_settings[name]
@@ -207,9 +476,70 @@ class Conjector:
     def _get_merged_settings(
         self, user_params: Optional[Settings]
     ) -> Settings:
-        global_settings = self._get_global_settings()
         settings = user_params if user_params else Settings()
-        return global_settings | settings
+        if settings.is_resolved():
+            return settings
+        return self._get_global_settings() | settings
+
+
+def _is_immutable(value: Any) -> bool:
+    if type(value) in (tuple, frozenset):
+        return all(_is_immutable(item) for item in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
+
+
+def register_converter(
+    type_: Type[_T], converter: Callable[[Type[_T], Any], _T]
+) -> None:
+    """
+    Register custom converter for type hints which aren't supported out of
+    the box (or to change the way supported types are cast).
+
+    Parameters
+    ----------
+    type_:
+        Type to convert config values to. Converter is also used for
+        subclasses of this type.
+    converter:
+        Callable which accepts exact type from type hint and value from config
+        and returns converted value.
+    """
+    Conjector._type_converter.register(type_, converter)
+
+
+def warmup(
+    paths: Iterable[Union[str, "os.PathLike[str]"]] = (),
+    *,
+    package: Optional[str] = None,
+    freeze: bool = True,
+) -> None:
+    """
+    Prepare configs before forking worker processes (e.g. in the master
+    process of pre-forking server), so workers don't parse config files and
+    cast values again. `Default` params of decorated functions and lazy
+    attributes of decorated classes are resolved, those which fail (e.g.
+    because of missing config file) are skipped with a warning.
+
+    Parameters
+    ----------
+    paths:
+        Config files to parse in addition to already parsed ones.
+    package:
+        Name of package to find and parse all config files in it. Files
+        which can't be parsed are skipped with a warning.
+    freeze:
+        Call `gc.freeze()` after warm-up, so garbage collector in child
+        processes doesn't touch (and copy) memory pages of already loaded
+        objects. Default value is **True**
+    """
+    ConfigHandler.preload(paths, package=package)
+    Conjector.resolve_pending_plans()
+    Conjector.resolve_pending_attributes()
+    # child processes can't use the pool of their parent
+    ConfigHandler.shutdown_process_pool()
+    if freeze:
+        gc.collect()
+        gc.freeze()
 
 
 @overload
@@ -221,6 +551,9 @@ def properties(
     root: str = ...,
     type_cast: bool = ...,
     lazy_init: bool = ...,
+    bake_defaults: bool = ...,
+    lazy_collections: bool = ...,
+    lazy_attributes: bool = ...,
 ) -> Callable[[Type[_T]], Type[_T]]:
     ...
 
@@ -234,6 +567,9 @@ def properties(
     root: str = ...,
     type_cast: bool = ...,
     lazy_init: bool = ...,
+    bake_defaults: bool = ...,
+    lazy_collections: bool = ...,
+    lazy_attributes: bool = ...,
 ) -> Type[_T]:
     ...
 
@@ -246,6 +582,9 @@ def properties(
     root: str = Default(""),
     type_cast: bool = Default(True),
     lazy_init: bool = Default(False),
+    bake_defaults: bool = Default(False),
+    lazy_collections: bool = Default(False),
+    lazy_attributes: bool = Default(False),
 ) -> Union[
     Callable[[Type[_T]], Union[Type[_T], Callable[..., _T]]],
     Union[Type[_T], Callable[..., _T]],
@@ -276,6 +615,21 @@ def properties(
         should be called when necessary. This method also accept boolean
         keyword param `override_init` to keep values of initialized class or
         override them with config values. Default value is **False**
+    bake_defaults:
+        Resolve `Default` params of a decorated function (or methods of a
+        decorated class) immediately and store them in a copy of the function
+        as regular defaults, like `dataclass` does for `__init__`. Calls of
+        such functions have no overhead, but config values are read once
+        during decoration. Default value is **False**
+    lazy_collections:
+        Cast `list` and `dict` values lazily. Such fields are read-only
+        `Sequence` and `Mapping` views which cast each element on first
+        access, so large collections cost only as much as the used elements.
+        Default value is **False**
+    lazy_attributes:
+        Read and cast config value of each class variable on first access to
+        it instead of doing it during decoration. Config errors are raised on
+        access too. Ignored if `lazy_init` is used. Default value is **False**
 
     Returns
     -------
@@ -285,20 +639,20 @@ def properties(
 
     @functools.wraps(cls)  # type: ignore
     def wrapper(cls_: Type[_T]) -> Union[Type[_T], Callable[..., _T]]:
-        def argument_handler(*args: Any, **kwargs: Any) -> Any:
-            return conjector.replace_defaults(cls_, args, kwargs, settings)
-
         if inspect.isfunction(cls_):
-            return argument_handler
+            return conjector.wrap_function(cls_, settings)
         return conjector.inject_config(cls_, settings=settings)
 
-    conjector = Conjector()
+    conjector = Conjector.shared()
     settings = Settings(
         filename=filename,
         override_default=override_default,
         root=root,
         type_cast=type_cast,
         lazy_init=lazy_init,
+        bake_defaults=bake_defaults,
+        lazy_collections=lazy_collections,
+        lazy_attributes=lazy_attributes,
     )
     if cls is None:
         return wrapper
@@ -0,0 +1,81 @@
+from typing import Any, Callable, Dict, List, Union
+
+import mmap
+from dataclasses import dataclass
+
+Content = Union[str, bytes, mmap.mmap]
+
+
+@dataclass(frozen=True)
+class ParserBackend:
+    # name of module to import, backend is skipped if it isn't installed
+    module: str
+    # accepts imported module and file content, returns parsed config
+    loads: Callable[[Any, Content], Any]
+    # content is read as bytes without decoding if parser supports it
+    accepts_bytes: bool = False
+    # large files are memory-mapped instead of reading if parser supports it
+    accepts_mmap: bool = False
+
+
+def _loads(module: Any, content: Content) -> Any:
+    return module.loads(content)
+
+
+def _loads_buffer(module: Any, content: Content) -> Any:
+    if not isinstance(content, mmap.mmap):
+        return module.loads(content)
+    # view is released explicitly, otherwise mapped file can't be closed
+    with memoryview(content) as view:
+        return module.loads(view)
+
+
+def _load_msgspec(module: Any, content: Content) -> Any:
+    from msgspec import json
+
+    if not isinstance(content, mmap.mmap):
+        return json.decode(content)
+    with memoryview(content) as view:
+        return json.decode(view)
+
+
+def _load_yaml(module: Any, content: Content) -> Any:
+    # memory-mapped file is read by the parser as a stream
+    try:
+        SafeLoader = module.CSafeLoader
+    except AttributeError:
+        SafeLoader = module.SafeLoader
+    # equivalent of yaml.safe_load() but could be faster with CSafeLoader
+    return module.load(content, SafeLoader)  # nosec
+
+
+def _load_toml(module: Any, content: Content) -> Any:
+    # TOML is always UTF-8, bytes are decoded the same way `tomllib.load`
+    # does it for binary files (the parser itself works with text)
+    if isinstance(content, bytes):
+        content = content.decode()
+    return module.loads(content)
+
+
+def get_default_backends() -> Dict[str, List[ParserBackend]]:
+    return {
+        "yaml": [
+            ParserBackend(
+                "yaml", _load_yaml, accepts_bytes=True, accepts_mmap=True
+            )
+        ],
+        "json": [
+            ParserBackend(
+                "orjson", _loads_buffer, accepts_bytes=True, accepts_mmap=True
+            ),
+            ParserBackend(
+                "msgspec", _load_msgspec, accepts_bytes=True, accepts_mmap=True
+            ),
+            ParserBackend("ujson", _loads, accepts_bytes=True),
+            ParserBackend("json", _loads, accepts_bytes=True),
+        ],
+        "toml": [
+            ParserBackend("tomllib", _load_toml, accepts_bytes=True),
+            ParserBackend("tomli", _load_toml, accepts_bytes=True),
+        ],
+    }
@@ -0,0 +1,96 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import marshal
+import os
+import pathlib
+import sys
+
+from conjector.config_cache import StatKey
+from conjector.config_snapshot import _SNAPSHOT_VERSION
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+SNAPSHOT_ENV_VAR = "CONJECTOR_SHARED_SNAPSHOT"
+_HEADER_SIZE = 8
+
+
+class SharedSnapshot:
+    def __init__(self, name: str) -> None:
+        from multiprocessing.shared_memory import SharedMemory
+
+        # memory is owned by the parent process, so it's released only by it
+        # (not by resource trackers of children when they exit)
+        if sys.version_info >= (3, 13):
+            self._memory = SharedMemory(name, track=False)
+        else:
+            from multiprocessing import resource_tracker
+
+            self._memory = SharedMemory(name)
+            if os.name == "posix":
+                resource_tracker.unregister(
+                    getattr(self._memory, "_name"), "shared_memory"
+                )
+        buffer = self._memory.buf
+        index_size = int.from_bytes(buffer[:_HEADER_SIZE], "little")
+        start = _HEADER_SIZE
+        self._data_offset = end = start + index_size
+        # snapshot is published by the parent process (its name is passed
+        # in the environment), as trusted as the config files themselves
+        version, index = marshal.loads(buffer[start:end])  # nosec
+        self._index: Dict[str, Tuple[int, int, StatKey]] = (
+            index if version == _SNAPSHOT_VERSION else {}
+        )
+
+    def get(self, path: pathlib.Path) -> Optional[Tuple[Any, StatKey]]:
+        if (item := self._index.get(str(path))) is None:
+            return None
+        offset, size, stat_key = item
+        start = self._data_offset + offset
+        end = start + size
+        # only requested configs are loaded from the shared memory
+        value = marshal.loads(self._memory.buf[start:end])  # nosec
+        return value, stat_key
+
+
+def publish_snapshot() -> "SharedMemory":
+    """
+    Store configs parsed by the current process in shared memory, so child
+    processes (including ones started with `spawn` method) load them from
+    there instead of parsing config files again.
+
+    Returns
+    -------
+    SharedMemory
+        Shared memory block with the snapshot. Its name is set to the
+        `CONJECTOR_SHARED_SNAPSHOT` environment variable, which is inherited
+        by child processes. The block should be kept until child processes
+        are started and then released with `close()` and `unlink()`.
+    """
+    from multiprocessing.shared_memory import SharedMemory
+
+    from conjector.config_handler import ConfigHandler
+
+    index = {}
+    payloads = []
+    offset = 0
+    for path, value, fingerprint in ConfigHandler.parsed_configs_map.items():
+        try:
+            payload = marshal.dumps(value)
+        except ValueError:
+            # configs with values unsupported by marshal are parsed as usual
+            continue
+        index[str(path)] = (offset, len(payload), fingerprint.stat_key)
+        payloads.append(payload)
+        offset += len(payload)
+    header = marshal.dumps((_SNAPSHOT_VERSION, index))
+    data_offset = _HEADER_SIZE + len(header)
+    size = data_offset + offset
+    memory = SharedMemory(create=True, size=size)
+    memory.buf[:_HEADER_SIZE] = len(header).to_bytes(_HEADER_SIZE, "little")
+    memory.buf[_HEADER_SIZE:data_offset] = header
+    memory.buf[data_offset:size] = b"".join(payloads)
+    # the current process already has these configs parsed
+    ConfigHandler._shared_snapshot_name = memory.name
+    os.environ[SNAPSHOT_ENV_VAR] = memory.name
+    return memory
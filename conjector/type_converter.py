@@ -1,5 +1,6 @@
 from typing import (
     Any,
+    Callable,
     Dict,
     List,
     Optional,
@@ -12,15 +13,35 @@ from typing import (
     get_type_hints,
 )
 
+import array
+import contextlib
 import decimal
 import enum
+import functools
 import inspect
 import pathlib
 import re
+import sys
+import threading
+from collections import OrderedDict
 from collections.abc import Iterable, Mapping
 from dataclasses import MISSING, Field, fields, is_dataclass
 from datetime import date, datetime, time, timedelta
 from itertools import zip_longest
+from weakref import WeakKeyDictionary
+
+from conjector.entities import TypeMetadata
+from conjector.lazy import LazyMapping, LazySequence
+
+if sys.version_info >= (3, 9):
+    from typing import Annotated
+else:
+    Annotated = None  # type: ignore
+
+_T = TypeVar("_T")
+Caster = Callable[[Any], Any]
+Compiler = Callable[[Any, tuple], Caster]
+Converter = Callable[[Any, Any], Any]
 
 
 class TypeConverter:
@@ -43,60 +64,257 @@ class TypeConverter:
         "0": False,
     }
 
+    _bulk_types = (int, float, str)
+    _int_typecodes = ("b", "B", "h", "H", "i", "I", "l", "L", "q", "Q")
+    _float_typecodes = ("f", "d")
+    _config_value_types = (str, int, float, bool, type(None), list, dict)
+    # types of values which always fail to cast to the type with
+    # `ValueError` or `TypeError`, so they are skipped in unions
+    _mismatched_types: Dict[type, Tuple[type, ...]] = {
+        int: (list, dict),
+        float: (list, dict),
+        list: (int, float, bool),
+        set: (int, float, bool),
+        frozenset: (int, float, bool),
+        tuple: (int, float, bool),
+        dict: (str, int, float, bool, list),
+        decimal.Decimal: (dict,),
+        pathlib.Path: (int, float, bool, list, dict),
+        re.Pattern: (type(None), int, float, bool, list, dict),
+    }
+    # compiled casters keep type hints (and classes in them) alive, so the
+    # cache is bounded like the cache of generic aliases in `typing`
+    max_casters = 1024
+
+    def __init__(self) -> None:
+        self._casters: OrderedDict[Any, Caster] = OrderedDict()
+        # casters which are being compiled by the current thread
+        self._pending = threading.local()
+        self._lock = threading.Lock()
+        self._converters: Dict[type, Converter] = {}
+        self._compilers: Dict[type, Compiler] = {
+            type(None): lambda type_, args: lambda value: None,
+            str: self._compile_base,
+            bool: lambda type_, args: self._cast_bool,
+            list: self._compile_list,
+            array.array: self._compile_array,
+            tuple: self._compile_tuple,
+            set: self._compile_set,
+            frozenset: self._compile_set,
+            dict: self._compile_dict,
+            datetime: self._compile_datetime,
+            date: self._compile_datetime,
+            time: self._compile_datetime,
+            timedelta: self._compile_datetime,
+            re.Pattern: lambda type_, args: self._apply_regex_pattern,
+            enum.Enum: self._compile_enum,
+            decimal.Decimal: lambda type_, args: self._apply_decimal,
+            pathlib.Path: lambda type_, args: self._apply_path,
+        }
+        self._mro_compilers: WeakKeyDictionary[
+            type, Optional[Compiler]
+        ] = WeakKeyDictionary()
+        self._metadata: WeakKeyDictionary[
+            type, TypeMetadata
+        ] = WeakKeyDictionary()
+
     def cast_types(self, type_: Union[Type, Any], value: Any) -> Any:
+        return self.compile(type_)(value)
+
+    def compile(self, type_: Union[Type, Any]) -> Caster:
+        key = self._get_cache_key(type_)
+        try:
+            caster = self._casters.get(key)
+        except TypeError:
+            # unhashable type hints are compiled every time
+            return self._compile_safe(type_)
+        if caster is not None:
+            with contextlib.suppress(KeyError):
+                self._casters.move_to_end(key)
+            return caster
+        # casters are published only when the outermost type is compiled,
+        # so other threads never get unfinished ones
+        pending = self._get_pending_casters()
+        if (caster := pending.get(key)) is not None:
+            return caster
+        is_outermost = not pending
+        # forward reference allows to compile recursive types
+        compiled: List[Caster] = []
+        pending[key] = lambda value: compiled[0](value)
+        try:
+            caster = self._compile_safe(type_)
+            compiled.append(caster)
+            pending[key] = caster
+            if is_outermost:
+                with self._lock:
+                    self._casters.update(pending)
+                    while len(self._casters) > self.max_casters:
+                        self._casters.popitem(last=False)
+        finally:
+            if is_outermost:
+                pending.clear()
+        return caster
+
+    def _get_pending_casters(self) -> Dict[Any, Caster]:
+        try:
+            return self._pending.casters
+        except AttributeError:
+            casters = self._pending.casters = {}
+            return casters
+
+    def compile_lazy(self, type_: Union[Type, Any]) -> Caster:
+        # only lists and dicts are cast lazily, other types (and lists or
+        # dicts in unions) are cast as usual
+        origin, args = get_origin(type_), get_args(type_)
+        caster = self.compile(type_)
+        if origin is list and args:
+            cast_item = self.compile(args[0])
+
+            def apply_lazy_list(values: Any) -> Any:
+                if values is None or values == "null":
+                    values = list()
+                if type(values) is not list:
+                    return caster(values)
+                return LazySequence(values, cast_item)
+
+            return apply_lazy_list
+        if origin is dict and args:
+            cast_key, cast_value = self.compile(args[0]), self.compile(args[1])
+
+            def apply_lazy_dict(values: Any) -> LazyMapping:
+                if values == "null":
+                    values = None
+                values = self._check_mapping(values)
+                return LazyMapping(
+                    {cast_key(k): v for k, v in values.items()}, cast_value
+                )
+
+            return apply_lazy_dict
+        return caster
+
+    def register(self, type_: Type[_T], converter: Converter) -> None:
+        """
+        Register custom converter for values of type `type_` and its
+        subclasses. Converter is called with exact type from type hint and
+        value from config.
+        """
+        self._converters[type_] = converter
+        self._compilers[type_] = self._compile_converter
+        self._mro_compilers.clear()
+        with self._lock:
+            self._casters.clear()
+
+    def get_type_metadata(self, type_: Any) -> TypeMetadata:
+        try:
+            metadata = self._metadata.get(type_)
+        except TypeError:
+            return self._get_type_metadata(type_)
+        if metadata is None:
+            metadata = self._metadata[type_] = self._get_type_metadata(type_)
+        return metadata
+
+    def _get_type_metadata(self, type_: Any) -> TypeMetadata:
+        init_fields: Tuple[Tuple[str, Any, Callable[[], Any]], ...] = ()
+        if is_dataclass(type_):
+            init_fields = tuple(
+                (
+                    field.name,
+                    field.type,
+                    functools.partial(self._get_dataclass_default, field),
+                )
+                for field in fields(type_)
+                if field.init
+            )
+        return TypeMetadata(get_type_hints(type_), init_fields)
+
+    def _get_cache_key(self, type_: Any) -> Any:
+        # `Union[int, str] == Union[str, int]`, but the order of args matters
+        if not (args := get_args(type_)):
+            return type_
+        return type_, tuple(self._get_cache_key(arg) for arg in args)
+
+    def _compile_safe(self, type_: Any) -> Caster:
+        try:
+            return self._compile(type_)
+        except Exception:
+            # unsupported type hints should fail only when values are cast
+            return lambda value: self._compile(type_)(value)
+
+    def _compile(self, type_: Any) -> Caster:
         args = args if (args := get_args(type_)) else (Any,)
         type_ = origin if (origin := get_origin(type_)) else type_
-        value = value if value != "null" else None
-        if (
-            self._is_unspecified(type_)
-            or self._is_terminate(type_, args)
-            and isinstance(value, type_)
-        ):
-            return value
+        if self._is_unspecified(type_):
+            return self._cast_null
+        if Annotated is not None and type_ is Annotated:
+            return self._compile_annotated(args)
+        is_terminate = self._is_terminate(type_, args)
+        caster = self._compile_type(type_, args)
+
+        def cast(value: Any) -> Any:
+            if value == "null":
+                value = None
+            if is_terminate and isinstance(value, type_):
+                return value
+            return caster(value)
+
+        return cast
+
+    def _compile_type(self, type_: Any, args: tuple) -> Caster:
         if self._is_union(type_):
-            return self._apply_union(args, value)
+            return self._compile_union(args)
+        compiler = self._get_compiler(type_)
+        if compiler is not None:
+            return compiler(type_, args)
         if issubclass(type_, Mapping):
-            return self._cast_mapping(type_, args, value)
+            return self._raise(
+                ValueError("Unsupported mapping type was found!")
+            )
         if issubclass(type_, Iterable):
-            return self._cast_iterable(type_, args, value)
-        if self._is_datetime(type_):
-            return self._apply_datetime(type_, value)
+            return self._raise(
+                ValueError("Unsupported iterable type was found!")
+            )
         if is_dataclass(type_):
-            return self._apply_dataclass(type_, value)
-        return self._cast_base(type_, value)
-
-    def _cast_iterable(self, type_: type, args: tuple, value: Any) -> Any:
-        if type_ == str:
-            return self._cast_base(type_, value)
-        if type_ == list:
-            return self._apply_list(args, value)
-        if issubclass(type_, tuple):
-            return self._apply_tuple(type_, args, value)
-        if type_ in (set, frozenset):
-            return self._apply_set(type_, args, value)
-        raise ValueError("Unsupported iterable type was found!")
-
-    def _cast_mapping(self, type_: type, args: tuple, value: Any) -> Any:
-        if issubclass(type_, dict):
-            return self._apply_dict(type_, args, value)
-        raise ValueError("Unsupported mapping type was found!")
+            return self._compile_dataclass(type_, args)
+        return self._compile_base(type_, args)
 
-    def _cast_base(self, type_: Type, value: Any) -> Any:
-        if self._is_none_type(type_):
+    def _get_compiler(self, type_: type) -> Optional[Compiler]:
+        if (compiler := self._compilers.get(type_)) is not None:
+            return compiler
+        if not inspect.isclass(type_):
             return None
-        if type_ == bool:
-            return self._cast_bool(value)
-        if type_ == re.Pattern:
-            return self._apply_regex_pattern(value)
+        try:
+            return self._mro_compilers[type_]
+        except KeyError:
+            pass
+        mro = type_.__mro__
         if issubclass(type_, enum.Enum):
-            return self._apply_enum(type_, value)
-        if type_ == decimal.Decimal:
-            return self._apply_decimal(value)
-        if type_ == pathlib.Path:
-            return self._apply_path(value)
-        if value is None:
-            return type_()
-        return type_(value)
+            # enums with mixins (like `class Color(str, Enum)`) are enums
+            mro = tuple(i for i in mro if issubclass(i, enum.Enum))
+        compiler = next(
+            (self._compilers[i] for i in mro if i in self._compilers), None
+        )
+        if compiler is None and self._is_ndarray(type_):
+            compiler = self._compile_ndarray
+        self._mro_compilers[type_] = compiler
+        return compiler
+
+    def _compile_base(self, type_: Type, args: tuple) -> Caster:
+        return lambda value: type_() if value is None else type_(value)
+
+    def _compile_converter(self, type_: Type, args: tuple) -> Caster:
+        converter = next(
+            self._converters[i] for i in type_.__mro__ if i in self._converters
+        )
+        return functools.partial(converter, type_)
+
+    def _compile_enum(self, type_: Type[enum.Enum], args: tuple) -> Caster:
+        return functools.partial(self._apply_enum, type_)
+
+    def _compile_datetime(self, type_: Type, args: tuple) -> Caster:
+        return functools.partial(self._apply_datetime, type_)
+
+    def _cast_null(self, value: Any) -> Any:
+        return value if value != "null" else None
 
     def _cast_bool(self, value: Any) -> Optional[bool]:
         if value is None:
@@ -105,71 +323,214 @@ class TypeConverter:
             return value
         return self._boolean_map.get(str(value))
 
-    def _apply_list(self, args: Tuple[Type[list], ...], values: Any) -> list:
-        if values is None:
-            values = list()
-        return [self.cast_types(args[0], i) for i in values]
+    def _compile_list(self, type_: type, args: tuple) -> Caster:
+        item_type = args[0]
+        cast_item = self.compile(item_type)
+        is_bulk = (
+            item_type in self._bulk_types and item_type not in self._converters
+        )
 
-    def _apply_set(
-        self, type_: type, args: Tuple[Type[set], ...], values: Any
-    ) -> set:
-        if values is None:
-            values = set()
-        return type_(self.cast_types(args[0], i) for i in values)
+        def apply_list(values: Any) -> list:
+            if values is None:
+                values = list()
+            # homogeneous lists are cast in bulk, if there are no values
+            # which are cast in a special way (like `null` to `0`)
+            if (
+                is_bulk
+                and type(values) is list
+                and None not in values
+                and "null" not in values
+            ):
+                return list(map(item_type, values))
+            return [cast_item(i) for i in values]
 
-    def _apply_tuple(
-        self, type_: Type[tuple], args: Any, values: Any
-    ) -> tuple:
-        if values is None:
-            values = tuple()
-        if not get_type_hints(type_):
+        return apply_list
+
+    def _compile_array(
+        self, type_: Type[array.array], args: tuple, typecode: str = ""
+    ) -> Caster:
+        cast_int, cast_float = self.compile(int), self.compile(float)
+
+        def cast_number(value: Any) -> Union[int, float]:
+            if isinstance(value, float):
+                return value
+            try:
+                return cast_int(value)
+            except ValueError:
+                return cast_float(value)
+
+        def apply_array(values: Any) -> array.array:
+            if values is None:
+                values = list()
+            if typecode in self._float_typecodes:
+                return type_(typecode, map(cast_float, values))
+            if typecode in self._int_typecodes:
+                return type_(typecode, map(cast_int, values))
+            if typecode:
+                return type_(typecode, values)
+            # typecode isn't specified, so it's resolved by values, lists
+            # of numbers are converted without casting each of them
+            try:
+                return type_("q", values)
+            except TypeError:
+                # not only integers, e.g. floats
+                with contextlib.suppress(TypeError):
+                    return type_("d", values)
+            except OverflowError:
+                pass
+            numbers = [cast_number(i) for i in values]
+            if not all(type(i) is int for i in numbers):
+                return type_("d", numbers)
+            try:
+                return type_("q", numbers)
+            except OverflowError as e:
+                # floats would lose precision of such integers
+                raise ValueError(
+                    f"Integers of array are too large: {e}"
+                ) from e
+
+        return apply_array
+
+    def _compile_ndarray(self, type_: type, args: tuple) -> Caster:
+        numpy = sys.modules["numpy"]
+        # `NDArray[dtype]` is `ndarray[shape, numpy.dtype[dtype]]`
+        dtype_args = get_args(args[1]) if len(args) == 2 else ()
+        dtype = dtype_args[0] if dtype_args else None
+        if self._is_unspecified(dtype):
+            dtype = None
+
+        def apply_ndarray(values: Any) -> Any:
+            if values is None:
+                values = list()
+            return numpy.array(values, dtype=dtype)
+
+        return apply_ndarray
+
+    def _compile_annotated(self, args: tuple) -> Caster:
+        type_, *metadata = args
+        if inspect.isclass(type_) and issubclass(type_, array.array):
+            typecode = next(
+                (
+                    i
+                    for i in metadata
+                    if isinstance(i, str) and i in array.typecodes
+                ),
+                "",
+            )
+            return self._compile_array(type_, (Any,), typecode)
+        return self.compile(type_)
+
+    def _compile_set(self, type_: type, args: tuple) -> Caster:
+        cast_item = self.compile(args[0])
+
+        def apply_set(values: Any) -> set:
+            if values is None:
+                values = set()
+            return type_(cast_item(i) for i in values)
+
+        return apply_set
+
+    def _compile_tuple(self, type_: Type[tuple], args: Any) -> Caster:
+        type_hints = self.get_type_metadata(type_).type_hints
+        if not type_hints:
             args = (Any, ...) if self._is_any(args) else args
-            args = self._resolve_ellipsis(args, values)
-            cast_values: Any = [
-                self.cast_types(arg, value) for arg, value in zip(args, values)
-            ]
-            return tuple(cast_values)
-        if isinstance(values, Mapping):
+            if ... in args:
+                return self._compile_variadic_tuple(args[0])
+            return self._compile_fixed_tuple(args)
+        field_casters = {k: self.compile(v) for k, v in type_hints.items()}
+
+        def apply_named_tuple(values: Any) -> tuple:
+            if values is None:
+                values = tuple()
+            if isinstance(values, Mapping):
+                cast_values = {}
+                for field, cast_field in field_casters.items():
+                    cast_values[field] = cast_field(values.get(field))
+                return type_(**cast_values)
+            if isinstance(values, Iterable):
+                cast_items = []
+                for cast_item, value in zip_longest(
+                    field_casters.values(), values
+                ):
+                    if cast_item is None:
+                        cast_item = self.compile(None)
+                    cast_items.append(cast_item(value))
+                return type_(*cast_items)
+            raise ValueError(
+                "NamedTuple values should be iterable or mapping!"
+            )
+
+        return apply_named_tuple
+
+    def _compile_variadic_tuple(self, arg: Any) -> Caster:
+        cast_item = self.compile(arg)
+
+        def apply_tuple(values: Any) -> tuple:
+            if values is None:
+                values = tuple()
+            self._check_length(values)
+            return tuple([cast_item(value) for value in values])
+
+        return apply_tuple
+
+    def _compile_fixed_tuple(self, args: Tuple[Any, ...]) -> Caster:
+        item_casters = [self.compile(arg) for arg in args]
+
+        def apply_tuple(values: Any) -> tuple:
+            if values is None:
+                values = tuple()
+            self._check_length(values)
+            return tuple(
+                [
+                    cast_item(value)
+                    for cast_item, value in zip(item_casters, values)
+                ]
+            )
+
+        return apply_tuple
+
+    def _compile_dict(self, type_: Type[dict], args: tuple) -> Caster:
+        if not self._is_any(args):
+            cast_key, cast_value = self.compile(args[0]), self.compile(args[1])
+
+            def apply_dict(values: Any) -> dict:
+                values = self._check_mapping(values)
+                return {cast_key(k): cast_value(v) for k, v in values.items()}
+
+            return apply_dict
+
+        type_hints = self.get_type_metadata(type_).type_hints
+        field_casters = {k: self.compile(v) for k, v in type_hints.items()}
+
+        def apply_typed_dict(values: Any) -> dict:
+            values = self._check_mapping(values)
             cast_values = {}
-            for field, arg in get_type_hints(type_).items():
-                cast_values[field] = self.cast_types(arg, values.get(field))
+            for field, cast_field in field_casters.items():
+                cast_values[field] = cast_field(values.get(field))
             return type_(**cast_values)
-        if isinstance(values, Iterable):
-            cast_values = []
-            for arg, value in zip_longest(
-                get_type_hints(type_).values(), values
-            ):
-                cast_values.append(self.cast_types(arg, value))
-            return type_(*cast_values)
-        raise ValueError("NamedTuple values should be iterable or mapping!")
 
-    def _apply_dict(self, type_: Type[dict], args: tuple, values: Any) -> dict:
-        if values is None:
-            values = dict()
-        if not isinstance(values, dict):
-            raise ValueError(f"Value '{values}' isn't mapping!")
-        if not self._is_any(args):
-            return {
-                self.cast_types(args[0], k): self.cast_types(args[1], v)
-                for k, v in values.items()
-            }
-        cast_values = {}
-        for field, arg in get_type_hints(type_).items():
-            cast_values[field] = self.cast_types(arg, values.get(field))
-        return type_(**cast_values)
-
-    def _apply_dataclass(self, type_: type, values: Any) -> Any:
-        if values is None:
-            values = dict()
-        field_mapping = {}
-        for field in fields(type_):
-            if not field.init:
-                continue
-            default = self._get_dataclass_default(field)
-            field_mapping[field.name] = self.cast_types(
-                field.type, values.get(field.name, default)
-            )
-        return type_(**field_mapping)
+        return apply_typed_dict
+
+    def _compile_dataclass(self, type_: type, args: tuple) -> Caster:
+        field_casters = [
+            (name, self.compile(field_type), get_default)
+            for name, field_type, get_default in self.get_type_metadata(
+                type_
+            ).init_fields
+        ]
+
+        def apply_dataclass(values: Any) -> Any:
+            if values is None:
+                values = dict()
+            field_mapping = {}
+            for name, cast_field, get_default in field_casters:
+                value = values.get(name, MISSING)
+                if value is MISSING:
+                    value = get_default()
+                field_mapping[name] = cast_field(value)
+            return type_(**field_mapping)
+
+        return apply_dataclass
 
     def _apply_datetime(
         self,
@@ -206,30 +567,69 @@ class TypeConverter:
             return field.default_factory()
         return None
 
-    def _resolve_ellipsis(
-        self, args: Tuple[type, ...], values: Any
-    ) -> Tuple[type, ...]:
+    def _check_length(self, values: Any) -> None:
         try:
-            value_len = len(values)
+            len(values)
         except TypeError:
             raise ValueError(f"Value {values} should be iterable!")
-        if ... in args:
-            return tuple(args[0] for _ in range(value_len))
-        return args
 
-    def _apply_union(self, args: Any, value: Any) -> Any:
+    def _check_mapping(self, values: Any) -> dict:
+        if values is None:
+            values = dict()
+        if not isinstance(values, dict):
+            raise ValueError(f"Value '{values}' isn't mapping!")
+        return values
+
+    def _compile_union(self, args: Any) -> Caster:
         is_optional = type(None) in args
-        if is_optional and value is None:
-            return None
         args = [i for i in args if not self._is_none_type(i)]
-        for arg in args:
-            try:
-                return self.cast_types(arg, value)
-            except (ValueError, TypeError):
-                continue
-        if is_optional:
-            return None
-        raise ValueError(f"Couldn't cast '{value}' to any of types: {args}")
+        item_casters = [self.compile(arg) for arg in args]
+        # casters which could succeed for values of each parsed config type,
+        # other types of values are probed with all casters in order
+        dispatch_table = {
+            value_type: [
+                cast_item
+                for arg, cast_item in zip(args, item_casters)
+                if value_type not in self._get_mismatched_types(arg)
+            ]
+            for value_type in self._config_value_types
+        }
+
+        def apply_union(value: Any) -> Any:
+            if is_optional and value is None:
+                return None
+            for cast_item in dispatch_table.get(type(value), item_casters):
+                try:
+                    return cast_item(value)
+                except (ValueError, TypeError):
+                    continue
+            if is_optional:
+                return None
+            raise ValueError(
+                f"Couldn't cast '{value}' to any of types: {args}"
+            )
+
+        return apply_union
+
+    def _get_mismatched_types(self, type_: Any) -> Tuple[type, ...]:
+        type_ = origin if (origin := get_origin(type_)) else type_
+        if not inspect.isclass(type_) or any(
+            i in self._converters for i in type_.__mro__
+        ):
+            return ()
+        if type_ in self._mismatched_types:
+            return self._mismatched_types[type_]
+        if issubclass(type_, dict):
+            return self._mismatched_types[dict]
+        if issubclass(type_, tuple):
+            return self._mismatched_types[tuple]
+        return ()
+
+    def _raise(self, error: Exception) -> Caster:
+        def raise_error(value: Any) -> Any:
+            raise type(error)(*error.args)
+
+        return raise_error
 
     def _apply_regex_pattern(self, values: Any) -> re.Pattern:
         if not isinstance(values, str):
@@ -275,12 +675,17 @@ class TypeConverter:
         return (
             self._is_any(args)
             and not self._is_primitive(type_)
-            and not get_type_hints(type_)
+            and not self.get_type_metadata(type_).type_hints
         )
 
     def _is_primitive(self, type_: type) -> bool:
         return any(issubclass(type_, i) for i in self._primitive_types)
 
+    def _is_ndarray(self, type_: type) -> bool:
+        # if numpy isn't imported, type hints can't contain its arrays
+        numpy = sys.modules.get("numpy")
+        return numpy is not None and issubclass(type_, numpy.ndarray)
+
     def _is_none_type(self, arg: Any) -> bool:
         return inspect.isclass(arg) and issubclass(arg, type(None))
 
@@ -290,8 +695,5 @@ class TypeConverter:
     def _is_unspecified(self, type_: Any) -> bool:
         return isinstance(type_, TypeVar) or type_ == Any
 
-    def _is_datetime(self, type_: type) -> bool:
-        return type_ in (datetime, date, time, timedelta)
-
     def _is_union(self, type_: type) -> bool:
         return type_ == Union or type_.__name__ == "UnionType"
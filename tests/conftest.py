@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import Mock, patch
 
 from conjector.config_handler import ConfigHandler
+from conjector.main import Conjector
 
 
 def patch_config(return_values: Dict[str, Any]):
@@ -17,3 +18,4 @@ def patch_config(return_values: Dict[str, Any]):
 @pytest.fixture(autouse=True)
 def clear_config_handler_cache():
     ConfigHandler.clear_cache()
+    Conjector.clear_cache()
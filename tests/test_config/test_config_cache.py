@@ -0,0 +1,157 @@
+import os
+import pytest
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from conjector.config_cache import ConfigCache
+from conjector.config_handler import ConfigHandler
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    file = tmp_path / "application.yml"
+    file.write_text("value: 1")
+    return file
+
+
+def rewrite_file(file, content):
+    stat = os.stat(file)
+    file.write_text(content)
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_changed_file_is_parsed_again(config_file):
+    with patch.object(ConfigHandler, "parsed_configs_map", ConfigCache(0)):
+        handler = ConfigHandler()
+        assert handler.parse_config(config_file) == {"value": 1}
+        rewrite_file(config_file, "value: 2")
+        assert handler.parse_config(config_file) == {"value": 2}
+
+
+def test_changed_file_is_not_checked_until_interval_passed(config_file):
+    with patch.object(ConfigHandler, "parsed_configs_map", ConfigCache(60)):
+        handler = ConfigHandler()
+        assert handler.parse_config(config_file) == {"value": 1}
+        rewrite_file(config_file, "value: 2")
+        assert handler.parse_config(config_file) == {"value": 1}
+
+
+def test_touched_file_with_same_content_is_not_parsed_again(config_file):
+    cache = ConfigCache(0, use_hash=True)
+    with patch.object(
+        ConfigHandler, "parsed_configs_map", cache
+    ), patch.object(
+        ConfigHandler, "_parse_yaml_config", return_value={"value": 1}
+    ) as mocked_parse_yaml:
+        handler = ConfigHandler()
+        handler.parse_config(config_file)
+        rewrite_file(config_file, "value: 1")
+        handler.parse_config(config_file)
+        mocked_parse_yaml.assert_called_once()
+
+
+def test_removed_file_is_dropped_from_cache(config_file):
+    cache = ConfigCache(0)
+    cache.set(config_file, {"value": 1})
+    config_file.unlink()
+    assert cache.get(config_file) is None
+    assert config_file not in cache
+
+
+def test_empty_config_is_cached(config_file):
+    with patch.object(
+        ConfigHandler, "_parse_yaml_config", return_value={}
+    ) as mocked_parse_yaml:
+        handler = ConfigHandler()
+        handler.parse_config(config_file)
+        handler.parse_config(config_file)
+        mocked_parse_yaml.assert_called_once()
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ConfigCache(max_entries=2)
+    first, second, third = (tmp_path / f"{i}.yml" for i in range(3))
+    for file in (first, second, third):
+        file.write_text("")
+    cache.set(first, {"value": 1})
+    cache.set(second, {"value": 2})
+    cache.get(first)
+    cache.set(third, {"value": 3})
+    assert first in cache
+    assert second not in cache
+    assert third in cache
+
+
+def test_entries_are_evicted_by_size(tmp_path):
+    first, second = tmp_path / "first.yml", tmp_path / "second.yml"
+    first.write_text("")
+    second.write_text("")
+    cache = ConfigCache()
+    cache.set(first, {"value": list(range(100))})
+    cache.max_size = cache.cache_info().size + 1
+    cache.set(second, {"value": list(range(100))})
+    assert first not in cache
+    assert second in cache
+
+
+def test_cache_info_footprint(config_file):
+    cache = ConfigCache()
+    cache.set(config_file, {"value": "some value"})
+    cache.get(config_file)
+    cache.get(config_file.with_name("missing.yml"))
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.entries) == (1, 1, 1)
+    assert info.size > 0
+    cache.pop(config_file)
+    assert cache.cache_info().size == 0
+
+
+def test_size_is_measured_only_if_used(config_file):
+    cache = ConfigCache()
+    with patch(
+        "conjector.config_cache._get_deep_size", return_value=10
+    ) as get_size:
+        cache.set(config_file, {"value": "some value"})
+        get_size.assert_not_called()
+        assert cache.cache_info().size == 10
+        cache.max_size = 100
+        cache.set(config_file, {"value": "other value"})
+    assert get_size.call_count == 2
+
+
+def test_concurrent_parsing_of_same_file_is_done_once(config_file):
+    def parse_yaml(content):
+        time.sleep(0.1)
+        return {"value": 1}
+
+    with patch.object(
+        ConfigHandler, "_parse_yaml_config", side_effect=parse_yaml
+    ) as mocked_parse_yaml, ThreadPoolExecutor(8) as executor:
+        handler = ConfigHandler()
+        futures = [
+            executor.submit(handler.parse_config, config_file)
+            for _ in range(8)
+        ]
+        results = [future.result() for future in futures]
+    mocked_parse_yaml.assert_called_once()
+    assert all(result is results[0] for result in results)
+
+
+def test_concurrent_parsing_error_is_raised_for_all_threads(config_file):
+    def parse_yaml(content):
+        time.sleep(0.1)
+        raise ValueError("invalid config")
+
+    with patch.object(
+        ConfigHandler, "_parse_yaml_config", side_effect=parse_yaml
+    ), ThreadPoolExecutor(4) as executor:
+        handler = ConfigHandler()
+        futures = [
+            executor.submit(handler.parse_config, config_file)
+            for _ in range(4)
+        ]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+    assert handler.parse_config(config_file) == {"value": 1}
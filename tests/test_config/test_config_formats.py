@@ -1,5 +1,6 @@
 import pytest
 import sys
+import yaml
 from unittest.mock import patch
 
 from conjector import properties
@@ -23,7 +24,7 @@ def test_yaml_config_format_with_cloader():
 
 
 def test_yaml_config_format_with_pyloader():
-    with patch.dict(sys.modules["yaml"].__dict__) as patched_yaml:
+    with patch.dict(yaml.__dict__) as patched_yaml:
         del patched_yaml["CSafeLoader"]
 
         @properties(filename="application.yml")
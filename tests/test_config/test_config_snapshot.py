@@ -0,0 +1,59 @@
+import datetime
+import os
+import pytest
+from unittest.mock import patch
+
+from conjector.config_handler import ConfigHandler
+from conjector.config_snapshot import SnapshotStore
+
+
+@pytest.fixture
+def snapshot_store(tmp_path):
+    store = SnapshotStore(tmp_path / "snapshots")
+    with patch.object(ConfigHandler, "snapshot_store", store):
+        yield store
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text("key: value\n")
+    return path
+
+
+def test_snapshot_is_used_by_next_process(snapshot_store, config_file):
+    handler = ConfigHandler(str(config_file.parent))
+    assert handler.parse_config(config_file) == {"key": "value"}
+    assert snapshot_store.get_snapshot_path(config_file).exists()
+    ConfigHandler.clear_cache()
+    with patch.object(ConfigHandler, "_parse_yaml_config") as parse_yaml:
+        assert handler.parse_config(config_file) == {"key": "value"}
+    parse_yaml.assert_not_called()
+
+
+def test_outdated_snapshot_is_rebuilt(snapshot_store, config_file):
+    handler = ConfigHandler(str(config_file.parent))
+    handler.parse_config(config_file)
+    stat = os.stat(config_file)
+    config_file.write_text("key: other\n")
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    ConfigHandler.clear_cache()
+    assert handler.parse_config(config_file) == {"key": "other"}
+    key = snapshot_store.get_key(config_file)
+    assert snapshot_store.load(config_file, key) == {"key": "other"}
+
+
+def test_invalid_snapshot_is_ignored(snapshot_store, config_file):
+    handler = ConfigHandler(str(config_file.parent))
+    handler.parse_config(config_file)
+    snapshot_store.get_snapshot_path(config_file).write_bytes(b"invalid")
+    ConfigHandler.clear_cache()
+    assert handler.parse_config(config_file) == {"key": "value"}
+
+
+def test_unsupported_values_are_not_stored(snapshot_store, config_file):
+    key = snapshot_store.get_key(config_file)
+    assert not snapshot_store.dump(
+        config_file, key, {"key": datetime.date(2022, 12, 11)}
+    )
+    assert not snapshot_store.get_snapshot_path(config_file).exists()
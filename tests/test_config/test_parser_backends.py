@@ -0,0 +1,124 @@
+import importlib.util
+import json
+import mmap
+import os
+import pytest
+import warnings
+from unittest.mock import Mock, patch
+
+from conjector.config_handler import ConfigHandler
+from conjector.parsers import ParserBackend
+
+
+@pytest.fixture
+def json_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"key": "value"}')
+    return path
+
+
+def test_first_installed_backend_is_used(json_file):
+    loads = Mock(return_value={"key": "mocked"})
+    backends = [
+        ParserBackend("not_installed_module", Mock()),
+        ParserBackend("json", loads, accepts_bytes=True),
+    ]
+    with patch.dict(ConfigHandler.parser_backends, {"json": backends}):
+        config = ConfigHandler(str(json_file.parent)).parse_config(json_file)
+    assert config == {"key": "mocked"}
+    loads.assert_called_once_with(json, b'{"key": "value"}')
+
+
+def test_backend_without_bytes_support_gets_text(json_file):
+    loads = Mock(return_value={})
+    with patch.dict(
+        ConfigHandler.parser_backends, {"json": [ParserBackend("json", loads)]}
+    ):
+        ConfigHandler(str(json_file.parent)).parse_config(json_file)
+    loads.assert_called_once_with(json, '{"key": "value"}')
+
+
+def test_orjson_backend(json_file):
+    orjson = pytest.importorskip("orjson")
+    with patch.object(orjson, "loads", wraps=orjson.loads) as loads:
+        config = ConfigHandler(str(json_file.parent)).parse_config(json_file)
+    assert config == {"key": "value"}
+    loads.assert_called_once_with(b'{"key": "value"}')
+
+
+def test_json_fallback_warns_once(json_file):
+    handler = ConfigHandler(str(json_file.parent))
+    with patch("conjector.config_handler.orjson", None), patch(
+        "conjector.config_handler.msgspec", None
+    ), patch("conjector.config_handler.ujson", None), patch.object(
+        ConfigHandler, "_json_fallback_warned", False
+    ), warnings.catch_warnings(
+        record=True
+    ) as records:
+        warnings.simplefilter("always")
+        assert handler.parse_config(json_file) == {"key": "value"}
+        ConfigHandler.clear_cache()
+        assert handler.parse_config(json_file) == {"key": "value"}
+    assert len(records) == 1
+
+
+def test_no_installed_backend(json_file):
+    with patch.dict(
+        ConfigHandler.parser_backends,
+        {"json": [ParserBackend("not_installed_module", Mock())]},
+    ), pytest.raises(ImportError):
+        ConfigHandler(str(json_file.parent)).parse_config(json_file)
+
+
+@pytest.mark.parametrize(
+    "filename, config_format",
+    [
+        ("application.yml", "yaml"),
+        pytest.param(
+            "application.json",
+            "json",
+            marks=pytest.mark.skipif(
+                not any(map(importlib.util.find_spec, ["orjson", "msgspec"])),
+                reason="only orjson and msgspec accept memory-mapped files",
+            ),
+        ),
+    ],
+)
+def test_large_files_are_memory_mapped(filename, config_format):
+    handler = ConfigHandler(os.path.dirname(__file__))
+    path = handler._get_config_path(filename)
+    expected = handler.parse_config(path)
+    backend, _ = handler._get_parser_backend(config_format)
+    content_types = []
+
+    def loads(module, content):
+        content_types.append(type(content))
+        return backend.loads(module, content)
+
+    backends = [ParserBackend(backend.module, loads, True, True)]
+    ConfigHandler.clear_cache()
+    with patch.object(ConfigHandler, "mmap_threshold", 1), patch.dict(
+        ConfigHandler.parser_backends, {config_format: backends}
+    ):
+        assert handler.parse_config(path) == expected
+    assert content_types == [mmap.mmap]
+
+
+def test_mmap_backend_gets_bytes_of_small_files(json_file):
+    loads = Mock(return_value={})
+    backends = [ParserBackend("json", loads, True, accepts_mmap=True)]
+    with patch.dict(ConfigHandler.parser_backends, {"json": backends}):
+        ConfigHandler(str(json_file.parent)).parse_config(json_file)
+    loads.assert_called_once_with(json, b'{"key": "value"}')
+
+
+def test_toml_backend_gets_bytes(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text('key = "значення"', encoding="utf-8")
+    backend, _ = ConfigHandler(str(tmp_path))._get_parser_backend("toml")
+    loads = Mock(wraps=backend.loads)
+    backends = [ParserBackend(backend.module, loads, accepts_bytes=True)]
+    with patch.dict(ConfigHandler.parser_backends, {"toml": backends}):
+        config = ConfigHandler(str(tmp_path)).parse_config(path)
+    assert config == {"key": "значення"}
+    assert isinstance(loads.call_args.args[1], bytes)
@@ -0,0 +1,73 @@
+import pytest
+import yaml
+from unittest.mock import patch
+
+from conjector.config_cache import _get_deep_size
+from conjector.config_handler import ConfigHandler
+
+CONFIG = """
+top-level:
+  nested-key:
+    value: 1
+defaults: &defaults
+  host: localhost
+  port: 80
+merged:
+  <<: *defaults
+  port: 8080
+  nested:
+    value: [1, 2]
+"""
+
+
+@pytest.fixture
+def partial_parsing(tmp_path):
+    (tmp_path / "config.yml").write_text(CONFIG)
+    with patch.object(ConfigHandler, "partial_yaml_parsing", True):
+        yield ConfigHandler(str(tmp_path))
+
+
+@pytest.mark.parametrize(
+    "root",
+    [
+        "top_level",
+        "top_level.nested-key",
+        "defaults.port",
+        "merged",
+        "merged.nested",
+    ],
+)
+def test_partial_parsing_equals_full_parsing(partial_parsing, root):
+    config = partial_parsing.get_config("config.yml", root=root)
+    with patch.object(ConfigHandler, "partial_yaml_parsing", False):
+        ConfigHandler.clear_cache()
+        assert config == partial_parsing.get_config("config.yml", root=root)
+
+
+@pytest.mark.parametrize("root", ["not_exist", "top-level", "merged.other"])
+def test_partial_parsing_missing_root(partial_parsing, root):
+    with pytest.raises(KeyError):
+        partial_parsing.get_config("config.yml", root=root)
+
+
+def test_partial_parsing_scans_file_once(partial_parsing):
+    with patch.object(yaml, "compose", wraps=yaml.compose) as compose:
+        first = partial_parsing.get_config("config.yml", root="defaults")
+        partial_parsing.get_config("config.yml", root="merged")
+        assert partial_parsing.get_config("config.yml", root="defaults") is (
+            first
+        )
+    assert compose.call_count == 1
+
+
+def test_partial_parsing_without_pyyaml(partial_parsing):
+    with patch("conjector.config_handler.yaml", None), pytest.raises(
+        ImportError
+    ):
+        partial_parsing.get_config("config.yml", root="defaults")
+
+
+def test_size_of_composed_config_includes_node_tree(partial_parsing):
+    partial_parsing.get_config("config.yml", root="top_level")
+    parsed_size = _get_deep_size(yaml.safe_load(CONFIG))
+    assert ConfigHandler.composed_configs_map.cache_info().size > parsed_size
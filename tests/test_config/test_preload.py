@@ -0,0 +1,64 @@
+import os
+import pathlib
+import pytest
+import sys
+import yaml
+from unittest.mock import patch
+
+from conjector import properties
+from conjector.config_handler import ConfigHandler
+
+CONFIG_DIR = pathlib.Path(__file__).parent
+
+
+def test_preloaded_config_is_not_parsed_again():
+    ConfigHandler.preload([CONFIG_DIR / "application.yml"])
+    with patch.object(ConfigHandler, "_parse_yaml_config") as parse_yaml:
+
+        @properties(filename="../test_config/application.yml")
+        class Preloaded:
+            int_var: int
+
+    parse_yaml.assert_not_called()
+    assert Preloaded.int_var == 5
+
+
+def test_preload_package_configs():
+    paths = ConfigHandler.preload(package="tests.test_config", max_workers=2)
+    assert [i.name for i in paths] == [
+        "application.ini",
+        "application.json",
+        "application.toml",
+        "application.yml",
+    ]
+    assert all(i in ConfigHandler.parsed_configs_map for i in paths)
+
+
+def test_preload_same_file_once():
+    path = CONFIG_DIR / "application.json"
+    relative_path = os.path.relpath(path)
+    with patch.object(
+        ConfigHandler, "_parse_json_config", return_value={}
+    ) as parse_json:
+        paths = ConfigHandler.preload([path, relative_path, str(path)])
+    assert paths == [path]
+    parse_json.assert_called_once()
+
+
+def test_invalid_found_files_are_skipped(tmp_path):
+    package = tmp_path / "preloaded_package"
+    (package / "templates").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "config.yml").write_text("key: value\n")
+    (package / "templates" / "deploy.yaml").write_text("key: {{ value }\n")
+    with patch.object(sys, "path", [str(tmp_path), *sys.path]):
+        with pytest.warns(UserWarning, match="deploy.yaml"):
+            paths = ConfigHandler.preload(package="preloaded_package")
+    assert paths == [package / "config.yml"]
+
+
+def test_invalid_explicit_file_is_raised(tmp_path):
+    path = tmp_path / "deploy.yaml"
+    path.write_text("key: {{ value }\n")
+    with pytest.raises(yaml.YAMLError):
+        ConfigHandler.preload([path])
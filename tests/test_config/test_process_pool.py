@@ -0,0 +1,47 @@
+import datetime
+import pathlib
+import pytest
+from unittest.mock import patch
+
+from conjector.config_handler import ConfigHandler
+
+CONFIG_PATH = pathlib.Path(__file__).parent / "application.yml"
+
+
+@pytest.fixture
+def process_pool():
+    with patch.object(ConfigHandler, "process_pool_threshold", 1):
+        yield
+    ConfigHandler.shutdown_process_pool()
+
+
+def test_large_yaml_is_parsed_in_process_pool(process_pool):
+    handler = ConfigHandler(str(CONFIG_PATH.parent))
+    config = handler.parse_config(CONFIG_PATH)
+    assert ConfigHandler._process_pool is not None
+    ConfigHandler.clear_cache()
+    with patch.object(ConfigHandler, "process_pool_threshold", None):
+        assert config == handler.parse_config(CONFIG_PATH)
+
+
+def test_values_unsupported_by_marshal(process_pool, tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text("date_var: 2022-12-11")
+    config = ConfigHandler(str(tmp_path)).parse_config(path)
+    assert config == {"date_var": datetime.date(2022, 12, 11)}
+
+
+def test_small_yaml_is_parsed_in_process():
+    handler = ConfigHandler(str(CONFIG_PATH.parent))
+    with patch.object(
+        ConfigHandler, "process_pool_threshold", 1024 * 1024
+    ), patch.object(ConfigHandler, "_parse_yaml_config") as parse_yaml:
+        handler.parse_config(CONFIG_PATH)
+    parse_yaml.assert_called_once()
+    assert ConfigHandler._process_pool is None
+
+
+def test_process_pool_doesnt_fork(process_pool):
+    ConfigHandler.preload([CONFIG_PATH], max_workers=2)
+    pool = ConfigHandler._process_pool
+    assert pool._mp_context.get_start_method() == "spawn"
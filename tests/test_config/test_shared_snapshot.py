@@ -0,0 +1,113 @@
+import contextlib
+import datetime
+import multiprocessing
+import os
+import pytest
+import subprocess
+import sys
+from unittest.mock import patch
+
+from conjector.config_handler import ConfigHandler
+from conjector.shared_snapshot import SNAPSHOT_ENV_VAR, publish_snapshot
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text("key: value\n")
+    return path
+
+
+@pytest.fixture
+def publish():
+    memories = []
+
+    def _publish():
+        memory = publish_snapshot()
+        memories.append(memory)
+        # emulate child process which hasn't attached the snapshot yet
+        ConfigHandler._shared_snapshot_name = None
+        ConfigHandler.clear_cache()
+        return memory
+
+    with patch.dict(os.environ):
+        yield _publish
+    for memory in memories:
+        memory.close()
+        with contextlib.suppress(FileNotFoundError):
+            memory.unlink()
+    ConfigHandler._shared_snapshot = None
+    ConfigHandler._shared_snapshot_name = None
+
+
+def test_config_is_loaded_from_shared_snapshot(publish, config_file):
+    handler = ConfigHandler(str(config_file.parent))
+    handler.parse_config(config_file)
+    memory = publish()
+    assert os.environ[SNAPSHOT_ENV_VAR] == memory.name
+    with patch.object(ConfigHandler, "_parse_yaml_config") as parse_yaml:
+        assert handler.parse_config(config_file) == {"key": "value"}
+    parse_yaml.assert_not_called()
+
+
+def test_changed_file_is_parsed_again(publish, config_file):
+    handler = ConfigHandler(str(config_file.parent))
+    handler.parse_config(config_file)
+    publish()
+    config_file.write_text("key: other\n")
+    os.utime(config_file, ns=(0, 0))
+    assert handler.parse_config(config_file) == {"key": "other"}
+
+
+def test_unsupported_values_are_not_shared(publish, tmp_path):
+    config_file = tmp_path / "config.yml"
+    config_file.write_text("date: 2022-12-11\n")
+    handler = ConfigHandler(str(tmp_path))
+    handler.parse_config(config_file)
+    publish()
+    assert ConfigHandler._get_shared_snapshot().get(config_file) is None
+    assert handler.parse_config(config_file) == {
+        "date": datetime.date(2022, 12, 11)
+    }
+
+
+def test_released_snapshot_is_ignored(publish, config_file):
+    handler = ConfigHandler(str(config_file.parent))
+    handler.parse_config(config_file)
+    memory = publish()
+    memory.close()
+    memory.unlink()
+    os.environ[SNAPSHOT_ENV_VAR] = "conjector-released"
+    assert ConfigHandler._get_shared_snapshot() is None
+    assert handler.parse_config(config_file) == {"key": "value"}
+
+
+def load_without_parsing(path):
+    with patch.object(
+        ConfigHandler, "_parse_yaml_config", side_effect=AssertionError
+    ):
+        return ConfigHandler(str(path.parent)).parse_config(path)
+
+
+def test_spawned_process_loads_config_from_shared_snapshot(
+    publish, config_file
+):
+    ConfigHandler(str(config_file.parent)).parse_config(config_file)
+    publish()
+    # a child which isn't started by multiprocessing attaches and exits
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import pathlib, sys\n"
+            "from conjector.config_handler import ConfigHandler\n"
+            "ConfigHandler._get_shared_snapshot().get(pathlib.Path(sys.argv[1]))",
+            str(config_file),
+        ],
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        check=True,
+    )
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        config = pool.apply(load_without_parsing, (config_file,))
+    assert config == {"key": "value"}
@@ -79,3 +79,28 @@ def test_settings_file_format(config_formats, expected_config):
         config_handler = Conjector()
         global_settings = config_handler._get_global_settings()
         assert global_settings == expected_config
+
+
+def test_global_settings_are_read_once(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.conjector]\nfilename = "first.yml"'
+    )
+    conjector = Conjector(str(tmp_path))
+    with patch.object(
+        ConfigHandler,
+        "get_global_settings",
+        wraps=conjector._config_handler.get_global_settings,
+    ) as mocked_get_global_settings:
+        assert conjector._get_global_settings().filename == "first.yml"
+        assert conjector._get_global_settings().filename == "first.yml"
+        mocked_get_global_settings.assert_called_once()
+
+
+def test_global_settings_are_read_again_if_file_changed(tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[tool.conjector]\nfilename = "first.yml"')
+    conjector = Conjector(str(tmp_path))
+    with patch.object(ConfigHandler.parsed_configs_map, "check_interval", 0):
+        assert conjector._get_global_settings().filename == "first.yml"
+        pyproject.write_text('[tool.conjector]\nfilename = "second.yaml"')
+        assert conjector._get_global_settings().filename == "second.yaml"
@@ -0,0 +1,73 @@
+import typing
+from typing import List
+
+import array
+import pytest
+import sys
+
+from conjector.type_converter import TypeConverter
+
+
+@pytest.mark.parametrize(
+    "type_,values,expected",
+    [
+        (List[int], [1, "2", 3.5], [1, 2, 3]),
+        (List[int], [1, None, "null"], [1, 0, 0]),
+        (List[float], ["1.5", 2], [1.5, 2.0]),
+        (List[str], [1, "a", None], ["1", "a", ""]),
+    ],
+)
+def test_homogeneous_list(type_, values, expected):
+    cast_values = TypeConverter().cast_types(type_, values)
+    assert cast_values == expected
+    assert [type(i) for i in cast_values] == [type(i) for i in expected]
+
+
+def test_homogeneous_list_with_invalid_value():
+    with pytest.raises(ValueError):
+        TypeConverter().cast_types(List[int], [1, "a"])
+
+
+@pytest.mark.parametrize(
+    "values,expected",
+    [
+        ([1, 2, 3], array.array("q", [1, 2, 3])),
+        ([1, 2.5, "3"], array.array("d", [1.0, 2.5, 3.0])),
+        (["1", "2"], array.array("q", [1, 2])),
+        ([1, None, "null"], array.array("q", [1, 0, 0])),
+        (["1.5", 2], array.array("d", [1.5, 2.0])),
+        (None, array.array("q")),
+    ],
+)
+def test_array_typecode_is_resolved_by_values(values, expected):
+    cast_values = TypeConverter().cast_types(array.array, values)
+    assert cast_values == expected
+    assert cast_values.typecode == expected.typecode
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 9),
+    reason="'Annotated' is available only for python with version >= 3.9",
+)
+def test_array_with_specified_typecode():
+    cast_values = TypeConverter().cast_types(
+        typing.Annotated[array.array, "f"], [1, 2.5]
+    )
+    assert cast_values == array.array("f", [1.0, 2.5])
+    assert cast_values.typecode == "f"
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 9),
+    reason="'Annotated' is available only for python with version >= 3.9",
+)
+def test_array_with_specified_typecode_casts_values():
+    cast_values = TypeConverter().cast_types(
+        typing.Annotated[array.array, "i"], ["1", None]
+    )
+    assert cast_values == array.array("i", [1, 0])
+
+
+def test_array_of_too_large_integers():
+    with pytest.raises(ValueError):
+        TypeConverter().cast_types(array.array, [2**64 + 1, 1])
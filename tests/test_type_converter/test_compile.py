@@ -0,0 +1,71 @@
+from typing import List, Sequence, Tuple, TypedDict, Union
+
+import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from unittest.mock import patch
+
+from conjector.type_converter import TypeConverter
+
+
+@dataclass
+class CustomClass:
+    int_var: int
+    tuple_var: Tuple[int, ...]
+
+
+class Node(TypedDict):
+    value: int
+    children: List["Node"]
+
+
+def test_compiled_caster_is_cached():
+    type_converter = TypeConverter()
+    caster = type_converter.compile(List[CustomClass])
+    assert type_converter.compile(List[CustomClass]) is caster
+    assert caster([{"int_var": "1", "tuple_var": ["2", 3]}]) == [
+        CustomClass(int_var=1, tuple_var=(2, 3))
+    ]
+
+
+def test_compiled_union_keeps_order_of_args():
+    type_converter = TypeConverter()
+    assert type_converter.cast_types(Union[int, str], "1") == 1
+    assert type_converter.cast_types(Union[str, int], "1") == "1"
+
+
+def test_unsupported_type_fails_only_on_cast():
+    caster = TypeConverter().compile(Sequence[int])
+    with pytest.raises(ValueError):
+        caster([1, 2, 3])
+
+
+def test_unfinished_caster_is_not_shared_between_threads():
+    type_converter = TypeConverter()
+    compile_safe = type_converter._compile_safe
+    started, release = threading.Event(), threading.Event()
+
+    def slow_compile(type_):
+        if type_ is CustomClass:
+            started.set()
+            release.wait(1)
+        return compile_safe(type_)
+
+    value = {"int_var": "1", "tuple_var": ["2"]}
+    with patch.object(type_converter, "_compile_safe", slow_compile):
+        with ThreadPoolExecutor(2) as pool:
+            first = pool.submit(type_converter.cast_types, CustomClass, value)
+            started.wait(1)
+            second = pool.submit(type_converter.cast_types, CustomClass, value)
+            wait([second], timeout=0.1)
+            release.set()
+    expected = CustomClass(int_var=1, tuple_var=(2,))
+    assert first.result() == second.result() == expected
+
+
+def test_recursive_type_is_compiled():
+    caster = TypeConverter().compile(Node)
+    assert caster(
+        {"value": "1", "children": [{"value": 2, "children": []}]}
+    ) == {"value": 1, "children": [{"value": 2, "children": []}]}
@@ -0,0 +1,39 @@
+from typing import List
+
+import ipaddress
+import pytest
+import uuid
+
+from conjector.type_converter import TypeConverter
+
+
+class CustomNetwork(ipaddress.IPv4Network):
+    pass
+
+
+@pytest.fixture
+def type_converter():
+    type_converter = TypeConverter()
+    type_converter.register(
+        ipaddress.IPv4Network, lambda type_, value: type_(value, strict=False)
+    )
+    return type_converter
+
+
+def test_registered_converter_is_used(type_converter):
+    assert type_converter.cast_types(
+        List[ipaddress.IPv4Network], ["10.0.0.1/8"]
+    ) == [ipaddress.IPv4Network("10.0.0.0/8")]
+
+
+def test_registered_converter_is_used_for_subclasses(type_converter):
+    network = type_converter.cast_types(CustomNetwork, "10.0.0.1/8")
+    assert type(network) is CustomNetwork
+
+
+def test_registered_converter_overrides_compiled_caster():
+    type_converter = TypeConverter()
+    with pytest.raises(AttributeError):
+        type_converter.cast_types(uuid.UUID, 12)
+    type_converter.register(uuid.UUID, lambda type_, value: type_(int=value))
+    assert type_converter.cast_types(uuid.UUID, 12) == uuid.UUID(int=12)
@@ -0,0 +1,32 @@
+from typing import Dict
+
+import pytest
+
+from conjector.type_converter import TypeConverter
+
+numpy = pytest.importorskip("numpy")
+numpy_typing = pytest.importorskip("numpy.typing")
+
+
+def test_ndarray_without_dtype():
+    cast_values = TypeConverter().cast_types(numpy.ndarray, [[1, 2], [3, 4]])
+    assert isinstance(cast_values, numpy.ndarray)
+    assert cast_values.shape == (2, 2)
+    assert cast_values.dtype.kind == "i"
+
+
+def test_ndarray_with_dtype():
+    cast_values = TypeConverter().cast_types(
+        Dict[str, numpy_typing.NDArray[numpy.float32]],
+        {"weights": [1, "2.5", 3]},
+    )
+    assert cast_values["weights"].dtype == numpy.float32
+    assert cast_values["weights"].tolist() == [1.0, 2.5, 3.0]
+
+
+def test_ndarray_from_empty_value():
+    cast_values = TypeConverter().cast_types(
+        numpy_typing.NDArray[numpy.int64], None
+    )
+    assert cast_values.size == 0
+    assert cast_values.dtype == numpy.int64
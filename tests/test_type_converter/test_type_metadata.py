@@ -0,0 +1,63 @@
+from typing import List, NamedTuple
+
+import gc
+import weakref
+from dataclasses import dataclass, field
+from unittest.mock import patch
+
+from conjector import type_converter
+from conjector.type_converter import TypeConverter
+
+
+class CustomTuple(NamedTuple):
+    int_var: int
+    str_var: str
+
+
+@dataclass
+class CustomClass:
+    int_var: int
+    list_var: List[int] = field(default_factory=list)
+    tuple_var: CustomTuple = CustomTuple(0, "")
+
+
+def test_type_hints_are_resolved_once_per_type():
+    values = [{"int_var": i, "tuple_var": [i, i]} for i in range(100)]
+    with patch.object(
+        type_converter, "get_type_hints", wraps=type_converter.get_type_hints
+    ) as mocked_get_type_hints:
+        cast_values = TypeConverter().cast_types(List[CustomClass], values)
+        assert mocked_get_type_hints.call_count == 2
+    assert cast_values[1] == CustomClass(1, [], CustomTuple(1, "1"))
+
+
+def test_dataclass_metadata_contains_init_fields_and_defaults():
+    metadata = TypeConverter().get_type_metadata(CustomClass)
+    assert [name for name, *_ in metadata.init_fields] == [
+        "int_var",
+        "list_var",
+        "tuple_var",
+    ]
+    assert [get_default() for *_, get_default in metadata.init_fields] == [
+        None,
+        [],
+        CustomTuple(0, ""),
+    ]
+
+
+def test_type_metadata_does_not_keep_class_alive():
+    type_converter = TypeConverter()
+    type_converter.max_casters = 0
+
+    @dataclass
+    class DynamicClass:
+        int_var: int
+
+    type_converter.get_type_metadata(DynamicClass)
+    assert type_converter.cast_types(
+        DynamicClass, {"int_var": "1"}
+    ) == DynamicClass(1)
+    class_ref = weakref.ref(DynamicClass)
+    del DynamicClass
+    gc.collect()
+    assert class_ref() is None
@@ -1,8 +1,11 @@
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import pytest
+from pathlib import Path
+from unittest.mock import patch
 
 from conjector import properties
+from conjector.type_converter import TypeConverter
 
 
 class BaseClass:
@@ -79,3 +82,18 @@ def test_cannot_cast_to_any_type(filename):
         @properties(filename=filename, root="union")
         class NotCastUnionClass:
             wrong_union_dict_list: Union[dict, List[dict]]
+
+
+def test_union_skips_types_which_can_not_be_cast_from_value_type():
+    type_converter = TypeConverter()
+    with patch.object(
+        type_converter,
+        "_apply_path",
+        side_effect=AssertionError("path cast shouldn't be probed"),
+    ):
+        caster = type_converter.compile(
+            Union[Tuple[int, int], Path, Dict[str, int], str]
+        )
+        assert caster([1, "2"]) == (1, 2)
+        assert caster({"a": "1"}) == {"a": 1}
+        assert caster(10) == "10"
@@ -0,0 +1,107 @@
+from typing import List, Tuple
+
+import inspect
+
+from conjector import properties
+from conjector.entities import Default
+from tests.conftest import patch_config
+
+
+@patch_config({"a": "20", "b": "2"})
+def test_baked_defaults_equal_config_values():
+    @properties(bake_defaults=True)
+    def func(a: int = Default(10), b: int = Default()) -> Tuple[int, int]:
+        return a, b
+
+    assert func() == (20, 2)
+    assert func(1) == (1, 2)
+    assert func.__defaults__ == (20, 2)
+
+
+@patch_config({})
+def test_baked_defaults_if_no_config():
+    @properties(bake_defaults=True)
+    def func(a: int = Default(10), b: int = Default()) -> Tuple[int, int]:
+        return a, b
+
+    assert func() == (10, 0)
+
+
+@patch_config({"a": "2", "b": "20", "c": "200"})
+def test_baked_defaults_of_positional_and_keyword_only_params():
+    @properties(bake_defaults=True)
+    def func(
+        a: int, b: int = Default(10), /, c: int = 5, *, d: int = Default(30)
+    ) -> Tuple[int, int, int, int]:
+        return a, b, c, d
+
+    assert func(1) == (1, 20, 5, 30)
+    assert func(1, 2, 3, d=4) == (1, 2, 3, 4)
+    assert func.__kwdefaults__ == {"d": 30}
+
+
+@patch_config({"a": "20", "b": "2"})
+def test_baked_function_is_not_wrapped():
+    def func(a: int = Default(10), b: int = Default()) -> Tuple[int, int]:
+        return a, b
+
+    baked_func = properties(bake_defaults=True)(func)
+
+    assert baked_func is not func
+    assert baked_func.__code__ is func.__code__
+    assert baked_func.__name__ == func.__name__
+    assert inspect.signature(baked_func).parameters["a"].default == 20
+    assert func.__defaults__ == (Default(10), Default())
+
+
+@patch_config({"a": "20", "b": "2"})
+def test_function_without_default_markers_is_returned_as_is():
+    def func(a: int = 10, b: int = 20) -> Tuple[int, int]:
+        return a, b
+
+    assert properties(bake_defaults=True)(func) is func
+
+
+@patch_config({"a": 10, "b": 20})
+def test_baked_defaults_of_class_methods():
+    @properties(bake_defaults=True)
+    class SomeClass:
+        def __init__(self, a: int = Default(), b: int = Default()) -> None:
+            self.a = a
+            self.b = b
+
+        def simple_method(
+            self, a: int = Default(), b: int = Default()
+        ) -> Tuple[int, int]:
+            return a, b
+
+        @classmethod
+        def cls_method(
+            cls, a: int = Default(), b: int = Default()
+        ) -> Tuple[int, int]:
+            return a, b
+
+        @staticmethod
+        def stat_method(
+            a: int = Default(), b: int = Default()
+        ) -> Tuple[int, int]:
+            return a, b
+
+    obj = SomeClass()
+    assert (obj.a, obj.b) == (10, 20)
+    assert obj.simple_method() == (10, 20)
+    assert SomeClass.cls_method() == (10, 20)
+    assert SomeClass.stat_method() == (10, 20)
+    assert SomeClass.__init__.__defaults__ == (10, 20)
+    assert SomeClass.simple_method.__defaults__ == (10, 20)
+
+
+@patch_config({"items": ["1", "2"]})
+def test_baked_mutable_defaults_are_shared_between_calls():
+    @properties(bake_defaults=True)
+    def func(items: List[int] = Default()) -> List[int]:
+        items.append(9)
+        return items
+
+    assert func() == [1, 2, 9]
+    assert func() == [1, 2, 9, 9]
@@ -0,0 +1,91 @@
+from typing import List
+
+import pytest
+from unittest.mock import Mock, patch
+
+from conjector import properties
+from conjector.config_handler import ConfigHandler
+from conjector.lazy import LazyAttribute
+
+
+def test_lazy_attributes_are_read_on_access():
+    get_config = Mock(return_value={"int_var": "10", "list_var": ["1"]})
+    with patch.object(ConfigHandler, "get_config", get_config):
+
+        @properties(lazy_attributes=True)
+        class LazyAttributes:
+            int_var: int
+            list_var: List[int]
+
+        assert get_config.call_count == 0
+        assert isinstance(vars(LazyAttributes)["int_var"], LazyAttribute)
+        assert LazyAttributes.int_var == 10
+        assert LazyAttributes.list_var == [1]
+        assert get_config.call_count == 1
+    assert vars(LazyAttributes)["int_var"] == 10
+
+
+def test_lazy_attributes_keep_defaults():
+    with patch.object(
+        ConfigHandler,
+        "get_config",
+        Mock(return_value={"int_var": 10, "str_var": "", "none_var": 5}),
+    ):
+
+        @properties(lazy_attributes=True)
+        class KeepDefault:
+            int_var: int = 5
+            none_var: int = None
+
+        @properties(lazy_attributes=True, override_default=True)
+        class OverrideDefault:
+            int_var: int = 5
+            str_var: str = "default"
+
+        assert KeepDefault.int_var == 5
+        assert KeepDefault.none_var == 5
+        assert OverrideDefault.int_var == 10
+        assert OverrideDefault.str_var == "default"
+
+
+def test_lazy_attributes_with_instance_values():
+    with patch.object(
+        ConfigHandler, "get_config", Mock(return_value={"int_var": 10})
+    ):
+
+        @properties(lazy_attributes=True)
+        class LazyAttributes:
+            int_var: int
+
+            def __init__(self, int_var: int) -> None:
+                self.int_var = int_var
+
+        assert LazyAttributes(5).int_var == 5
+        assert LazyAttributes.int_var == 10
+
+
+def test_lazy_attributes_init_props():
+    with patch.object(
+        ConfigHandler, "get_config", Mock(return_value={"int_var": 10})
+    ):
+
+        @properties(lazy_attributes=True)
+        class LazyAttributes:
+            int_var: int
+
+        instance = LazyAttributes()
+        instance.init_props()
+        assert vars(instance)["int_var"] == 10
+
+
+def test_lazy_attributes_raise_on_access():
+    with patch.object(
+        ConfigHandler, "get_config", Mock(side_effect=FileNotFoundError)
+    ):
+
+        @properties(filename="not_exist.yml", lazy_attributes=True)
+        class LazyAttributes:
+            int_var: int
+
+        with pytest.raises(FileNotFoundError):
+            LazyAttributes.int_var
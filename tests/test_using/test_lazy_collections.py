@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional
+
+import pytest
+from dataclasses import dataclass
+
+from conjector import properties, register_converter
+from conjector.entities import Default
+from conjector.lazy import LazyMapping, LazySequence
+from tests.conftest import patch_config
+
+
+@dataclass
+class Service:
+    name: str
+    port: int
+
+
+def test_lazy_list_is_cast_on_access():
+    with patch_config(
+        {"services": [{"name": "a", "port": "1"}, {"name": "b", "port": 2}]}
+    ):
+
+        @properties(lazy_collections=True)
+        class Services:
+            services: List[Service]
+
+    assert isinstance(Services.services, LazySequence)
+    assert Services.services[0] == Service("a", 1)
+    assert Services.services[0] is Services.services[0]
+    assert Services.services == [Service("a", 1), Service("b", 2)]
+    assert Services.services[-1:] == [Service("b", 2)]
+
+
+def test_lazy_list_casts_only_used_values():
+    cast_values = []
+
+    class Item(str):
+        pass
+
+    register_converter(Item, lambda type_, value: cast_values.append(value))
+    with patch_config({"items": ["a", "b", "c"]}):
+
+        @properties(lazy_collections=True)
+        class Items:
+            items: List[Item]
+
+    Items.items[1]
+    Items.items[1]
+    assert cast_values == ["b"]
+
+
+def test_lazy_dict_is_cast_on_access():
+    with patch_config({"services": {"1": {"name": "a", "port": "1"}}}):
+
+        @properties(lazy_collections=True)
+        class Services:
+            services: Dict[int, Service]
+
+    assert isinstance(Services.services, LazyMapping)
+    assert list(Services.services) == [1]
+    assert Services.services[1] == Service("a", 1)
+    assert Services.services == {1: Service("a", 1)}
+    with pytest.raises(KeyError):
+        Services.services["1"]
+
+
+def test_lazy_collections_with_empty_values():
+    with patch_config({"services": "null"}):
+
+        @properties(lazy_collections=True)
+        class Services:
+            services: List[Service]
+            mapping: Dict[str, Service]
+            other: Optional[List[int]]
+
+    assert Services.services == []
+    assert Services.mapping == {}
+    assert Services.other is None
+
+
+def test_lazy_list_raises_on_access():
+    with patch_config({"services": [{"name": "a", "port": "invalid"}]}):
+
+        @properties(lazy_collections=True)
+        class Services:
+            services: List[Service]
+
+    with pytest.raises(ValueError):
+        Services.services[0]
+
+
+@patch_config({"items": [{"a": "1"}]})
+def test_lazy_default_of_function_is_shared_between_calls():
+    @properties(lazy_collections=True)
+    def func(items: List[Dict[str, int]] = Default()) -> int:
+        items[0]["a"] += 1
+        return items[0]["a"]
+
+    assert func() == 2
+    assert func() == 3
@@ -1,7 +1,14 @@
+from typing import List, Tuple
+
+import os
+import subprocess
+import sys
 from unittest.mock import patch
 
-from conjector import properties
+from conjector import Conjector, properties
 from conjector.config_handler import ConfigHandler
+from conjector.entities import Default, Settings
+from conjector.type_converter import TypeConverter
 
 
 @patch.object(ConfigHandler, "get_global_settings")
@@ -39,3 +46,102 @@ def test_decorator_for_func_will_read_same_config_once(
     func()
 
     mocked_get_config.assert_called_once()
+
+
+@patch.object(ConfigHandler, "get_global_settings")
+@patch.object(ConfigHandler, "get_config")
+def test_decorator_for_func_will_resolve_defaults_once(
+    mocked_get_config, mocked_get_global_settings
+):
+    mocked_get_config.return_value = {"a": "10", "b": "20"}
+    mocked_get_global_settings.return_value = {}
+
+    @properties
+    def func(a: int = Default(), b: int = Default()) -> Tuple[int, int]:
+        return a, b
+
+    with patch.object(
+        TypeConverter, "cast_types", wraps=TypeConverter().cast_types
+    ) as mocked_cast_types:
+        assert func() == (10, 20)
+        assert func(1) == (1, 20)
+        assert func(b=2) == (10, 2)
+
+    mocked_get_config.assert_called_once()
+    mocked_get_global_settings.assert_called_once()
+    assert mocked_cast_types.call_count == 2
+
+
+def test_caller_directory_is_resolved_without_stack_inspection():
+    with patch("inspect.stack", side_effect=AssertionError):
+        conjector = Conjector()
+    assert conjector._config_handler._caller_dir == os.path.dirname(__file__)
+
+
+def test_decorators_in_same_module_share_conjector():
+    with patch.object(Conjector, "_shared_instances", {}):
+
+        @properties
+        class FirstClass:
+            int_var: int
+
+        @properties
+        class SecondClass:
+            int_var: int
+
+        assert len(Conjector._shared_instances) == 1
+        conjector = Conjector.shared()
+        assert Conjector._shared_instances == {
+            os.path.dirname(__file__): conjector
+        }
+
+
+def test_import_does_not_load_parsers_and_submodules():
+    code = (
+        "import sys, conjector; "
+        "assert 'conjector.main' not in sys.modules; "
+        "from conjector.config_handler import ConfigHandler; "
+        "assert not {'yaml', 'json', 'configparser'} & set(sys.modules); "
+        "from conjector import properties; "
+        "assert 'conjector.main' in sys.modules"
+    )
+    project_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=project_dir)
+
+
+@patch.object(ConfigHandler, "get_global_settings")
+@patch.object(ConfigHandler, "get_config")
+def test_mutable_defaults_are_not_shared_between_calls(
+    mocked_get_config, mocked_get_global_settings
+):
+    mocked_get_config.return_value = {"items": ["1", "2"]}
+    mocked_get_global_settings.return_value = {}
+
+    @properties
+    def func(items: List[int] = Default()) -> List[int]:
+        items.append(9)
+        return items
+
+    assert func() == [1, 2, 9]
+    assert func() == [1, 2, 9]
+    mocked_get_config.assert_called_once()
+
+
+def test_call_plan_is_resolved_again_after_config_change(tmp_path):
+    config_file = tmp_path / "config.yml"
+    config_file.write_text("a: 1\n")
+
+    def func(a: int = Default()) -> int:
+        return a
+
+    func = Conjector(str(tmp_path)).wrap_function(
+        func, Settings(filename="config.yml")
+    )
+    assert func() == 1
+    config_file.write_text("a: 22\n")
+    ConfigHandler.clear_cache()
+    assert func() == 22
+    config_file.write_text("a: 333\n")
+    os.utime(config_file, ns=(0, 0))
+    with patch.object(ConfigHandler.parsed_configs_map, "check_interval", 0):
+        assert func() == 333
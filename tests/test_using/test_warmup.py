@@ -0,0 +1,84 @@
+import gc
+import pytest
+from unittest.mock import patch
+
+from conjector import Conjector, properties, warmup
+from conjector.config_handler import ConfigHandler
+from conjector.entities import Default
+from conjector.lazy import LazyAttribute
+
+
+@pytest.fixture
+def unfreeze():
+    yield
+    gc.unfreeze()
+
+
+def test_warmup_resolves_function_defaults(unfreeze):
+    @properties
+    def func(int_var: int = Default()):
+        return int_var
+
+    with patch.object(
+        ConfigHandler, "get_config", return_value={"int_var": 5}
+    ):
+        warmup()
+    with patch.object(ConfigHandler, "get_config") as get_config:
+        assert func() == 5
+    get_config.assert_not_called()
+    assert gc.get_freeze_count() > 0
+
+
+def test_warmup_parses_package_configs(unfreeze):
+    warmup(package="tests.test_using", freeze=False)
+    with patch.object(ConfigHandler, "_parse_yaml_config") as parse_yaml:
+
+        @properties
+        class Config:
+            int_var: int
+
+    parse_yaml.assert_not_called()
+    assert gc.get_freeze_count() == 0
+
+
+def test_pending_plans_of_deleted_functions_are_removed():
+    @properties
+    def func(int_var: int = Default()):
+        return int_var
+
+    gc.collect()
+    plans_count = len(Conjector._pending_plans)
+    del func
+    gc.collect()
+    assert len(Conjector._pending_plans) == plans_count - 1
+
+
+def test_warmup_skips_failed_plans(unfreeze):
+    @properties(filename="missing.yml")
+    def failed(missing_var: int = Default()):
+        return missing_var
+
+    @properties
+    def func(int_var: int = Default()):
+        return int_var
+
+    with pytest.warns(UserWarning, match="missing.yml"):
+        warmup()
+    assert gc.get_freeze_count() > 0
+    assert any(
+        "missing_var" in plan.signature.parameters
+        for plan in Conjector._pending_plans
+    )
+    with patch.object(ConfigHandler, "get_config") as get_config:
+        assert func() == 10
+    get_config.assert_not_called()
+
+
+def test_warmup_resolves_lazy_attributes(unfreeze):
+    @properties(lazy_attributes=True)
+    class Config:
+        int_var: int
+
+    assert isinstance(vars(Config)["int_var"], LazyAttribute)
+    warmup(freeze=False)
+    assert vars(Config)["int_var"] == 10